@@ -0,0 +1,232 @@
+# Helper Streamlit yang dipakai bersama oleh halaman di app_pages/.
+#
+# Modul cpro yang menarik pandas/pyarrow di-import di dalam fungsi, jadi
+# halaman yang tidak memakainya (File Repository) tidak ikut membayar import.
+import os
+import tempfile
+from pathlib import Path
+
+import streamlit as st
+
+from cpro.jobs import CANCELLED, DONE, FAILED, JobManager
+from cpro.settings import cache_dir
+
+APP_DIR = Path(__file__).parent
+
+
+# Profiler rerun ini (dibuat di app.py sebelum halaman dijalankan)
+def current_profiler():
+    return st.session_state.profiler
+
+
+# Cache upload dipakai bersama semua sesi; file yang sama cukup di-parse sekali
+@st.cache_resource
+def get_upload_cache():
+    from cpro.ingest import UploadCache
+
+    return UploadCache.from_env()
+
+
+def read_upload(uploaded_file, **kwargs):
+    name = getattr(uploaded_file, "name", "file")
+    return current_profiler().call(f"read:{name}", get_upload_cache().read_excel, uploaded_file, **kwargs)
+
+
+# Hanya potongan awal file (header + beberapa baris), untuk mode streaming
+def read_upload_preview(uploaded_file, rows=100):
+    import io
+
+    from cpro.ingest import peek_table
+
+    data = io.BytesIO(uploaded_file.getvalue())
+    return current_profiler().call(f"read:{uploaded_file.name}:preview", peek_table, data, rows, uploaded_file.name)
+
+
+# Beberapa upload sekaligus: hanya kolom yang dipakai halaman, di-parse paralel
+def read_uploads(uploaded_files, columns):
+    with current_profiler().stage("read:" + "+".join(f.name for f in uploaded_files)) as record:
+        frames = get_upload_cache().read_many(uploaded_files, columns)
+        record["rows_out"] = sum(len(df) for df in frames)
+    return frames
+
+
+# Tombol download yang isinya baru dibuat saat diminta, lalu disimpan per sesi
+# selama `export_key` (upload + filter + format) tidak berubah
+def lazy_download_button(state_key, export_key, build, label, file_name, mime):
+    cached = st.session_state.get(state_key)
+    if cached is None or cached[0] != export_key:
+        if not st.button("📦 Siapkan file export", key=f"{state_key}_build"):
+            return
+        with st.spinner("Menyiapkan file export..."):
+            cached = (export_key, build())
+        st.session_state[state_key] = cached
+    st.download_button(label=label, data=cached[1], file_name=file_name, mime=mime)
+
+
+# Snapshot harian Komparasi Progress (SQLite di folder cache)
+@st.cache_resource
+def get_snapshot_store():
+    from cpro.snapshots import SnapshotStore
+
+    folder = cache_dir() or Path(tempfile.gettempdir())
+    folder.mkdir(parents=True, exist_ok=True)
+    return SnapshotStore(folder / "snapshots.sqlite")
+
+
+# Template dilayani dari file bawaan; update dari GitHub diambil di background
+@st.cache_resource
+def get_template_store():
+    from cpro.templates import REMOTE_BASE, TemplateStore
+
+    folder = cache_dir()
+    refresh = os.environ.get("CPRO_TEMPLATE_REFRESH", "1") != "0"
+    return TemplateStore(
+        APP_DIR,
+        cache_dir=folder / "templates" if folder else None,
+        remote_base=REMOTE_BASE if refresh else None,
+    )
+
+
+# Kamus COMPLIANCE_INDICATOR -> CI_CODE, disimpan di folder cache
+@st.cache_resource
+def get_ci_codebook():
+    from cpro.ci_codes import CICodeBook
+
+    folder = cache_dir()
+    if folder is None:
+        return CICodeBook()
+    folder.mkdir(parents=True, exist_ok=True)
+    return CICodeBook(folder / "ci_codes.json")
+
+
+# Job background (thread pool) dipakai bersama semua sesi; hasil dikunci dengan input-nya
+@st.cache_resource
+def get_job_manager():
+    return JobManager(max_workers=int(os.environ.get("CPRO_JOB_WORKERS", "2")))
+
+
+# Engine WP dibangun di job background, sekali per kombinasi isi upload (bukan per rerun);
+# `partitioned` memproses per AREA dengan spill Parquet ke folder cache. Job yang
+# gagal/dibatalkan baru diulang kalau diminta (`restart`), bukan otomatis tiap rerun.
+def submit_wp_engine(upload_keys, partitioned, df_branch, df_wp, df_progress, restart=False):
+    from cpro.wp_partition import build_engine
+
+    jobs = get_job_manager()
+    key = ("wp_engine", upload_keys, partitioned)
+    job = jobs.get(key)
+    if job is not None and not restart:
+        return job
+    folder = cache_dir()
+    return jobs.submit(
+        key, build_engine, df_branch, df_wp, df_progress,
+        codebook=get_ci_codebook(), partitioned=partitioned,
+        spill_dir=folder / "wp_parts" if folder else None,
+        label="Engine WP Progress",
+    )
+
+
+@st.fragment(run_every=1.0)
+def _job_progress(job):
+    # dicek ulang tiap detik tanpa rerun halaman; selesai -> rerun penuh untuk menampilkan hasil
+    if job.done:
+        st.rerun()
+    st.progress(job.fraction, text=f"⏳ {job.label}: {job.message} ({job.elapsed:.0f} s)")
+    st.button("⛔ Batalkan", key=f"job_cancel_{job.id}", on_click=job.cancel)
+
+
+def job_result(job):
+    """Hasil `job` kalau sudah selesai; selama berjalan tampilkan progress dan tombol batal."""
+    if job.status == DONE:
+        return job.result
+    if job.status == FAILED:
+        st.error(f"❌ {job.label} gagal: {job.error}")
+    elif job.status == CANCELLED:
+        st.warning(f"⛔ {job.label} dibatalkan.")
+    else:
+        _job_progress(job)
+    return None
+
+
+# Hasil Setup Monitoring + index filternya dibangun sekali per kombinasi upload & daftar LOB
+@st.cache_resource(max_entries=4, show_spinner="Menyiapkan data Setup Monitoring...")
+def get_setup_monitoring(upload_keys, lob_list, _df_branch, _df_real):
+    from cpro.filter_index import FilterIndex
+    from cpro.monitoring import FILTER_COLUMNS, build_setup_monitoring
+
+    df_merge = build_setup_monitoring(_df_branch, _df_real, list(lob_list))
+    return df_merge, FilterIndex(df_merge, FILTER_COLUMNS)
+
+
+def _shift_page(page_key, step, n_pages):
+    st.session_state[page_key] = min(max(st.session_state.get(page_key, 1) + step, 1), n_pages)
+
+
+# Tabel berhalaman: cari, urut, dan potong halaman dihitung di server;
+# browser hanya menerima baris halaman yang sedang dilihat
+def paged_table(key, source, columns=None, total=None, cache_key=None):
+    """`source` = DataFrame, atau fungsi tanpa argumen yang menghasilkan potongan DataFrame.
+
+    Untuk sumber fungsi beri `cache_key` (isi data + filter) supaya halaman yang
+    sama tidak dihitung ulang di setiap rerun, dan `total` kalau jumlah baris
+    sudah diketahui (halaman tanpa cari/urut berhenti lebih awal).
+    """
+    from cpro.grid import DEFAULT_PAGE_SIZE, PAGE_SIZES, query_page
+
+    profiler = current_profiler()
+    columns = list(source.columns) if columns is None else list(columns)
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        search = st.text_input("🔎 Cari", key=f"{key}_search", placeholder="Teks di kolom mana saja").strip()
+    with col2:
+        sort_by = st.selectbox(
+            "Urutkan", [None] + columns, key=f"{key}_sort",
+            format_func=lambda c: "(urutan asli)" if c is None else c
+        )
+    with col3:
+        ascending = st.radio(
+            "Arah", [True, False], key=f"{key}_asc", horizontal=True,
+            format_func={True: "↑", False: "↓"}.get
+        )
+    with col4:
+        size = st.selectbox("Baris/halaman", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE), key=f"{key}_size")
+
+    # query berubah -> kembali ke halaman 1
+    page_key = f"{key}_page"
+    query = (cache_key, search, sort_by, ascending, size)
+    if st.session_state.get(f"{key}_query") != query:
+        st.session_state[f"{key}_query"] = query
+        st.session_state[page_key] = 1
+    page_no = st.session_state.get(page_key, 1)
+
+    signature = query + (page_no,)
+    cached = st.session_state.get(f"{key}_result") if cache_key is not None else None
+    if cached is None or cached[0] != signature:
+        chunks = source() if callable(source) else source
+        with profiler.stage("grid:query") as record:
+            page, matched = query_page(
+                chunks, search or None, sort_by, ascending, (page_no - 1) * size, size, total=total
+            )
+            record["rows_out"] = len(page)
+        cached = (signature, page, matched)
+        if cache_key is not None:
+            st.session_state[f"{key}_result"] = cached
+    _, page, matched = cached
+
+    n_pages = max(1, -(-matched // size))
+    if page_no > n_pages:
+        st.session_state[page_key] = n_pages
+        st.rerun()
+
+    first = (page_no - 1) * size
+    st.caption(f"Baris {first + 1:,}–{first + len(page):,} dari {matched:,}" if matched else "Tidak ada baris yang cocok.")
+    profiler.call("render:table", st.dataframe, page, use_container_width=True)
+
+    nav1, nav2, nav3 = st.columns([1, 2, 1])
+    with nav1:
+        st.button("◀ Sebelumnya", key=f"{key}_prev", on_click=_shift_page, args=(page_key, -1, n_pages),
+                  disabled=page_no <= 1)
+    with nav2:
+        st.number_input(f"Halaman (dari {n_pages:,})", min_value=1, max_value=n_pages, step=1, key=page_key)
+    with nav3:
+        st.button("Berikutnya ▶", key=f"{key}_next", on_click=_shift_page, args=(page_key, 1, n_pages),
+                  disabled=page_no >= n_pages)
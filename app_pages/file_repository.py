@@ -0,0 +1,23 @@
+# File Repository: download template (tanpa pandas/plotly)
+import streamlit as st
+
+from app_common import get_template_store
+from cpro.templates import TEMPLATE_FILES, XLSX_MIME
+
+st.title("📂 File Repository (Download Template File)")
+
+st.subheader("⬇️ Download Template File")
+
+store = get_template_store()
+store.refresh_async()
+for label, file_name in TEMPLATE_FILES.items():
+    data = store.get(file_name)
+    if data is not None:
+        st.download_button(
+            label=f"⬇️ Download {label}",
+            data=data,
+            file_name=file_name,
+            mime=XLSX_MIME
+        )
+    else:
+        st.warning(f"⚠️ {label} gagal dimuat.")
@@ -0,0 +1,200 @@
+# Komparasi Progress: before vs after dan tren harian dari snapshot
+from collections import defaultdict
+from datetime import datetime
+
+import plotly.express as px
+import streamlit as st
+
+from app_common import (
+    current_profiler, get_ci_codebook, get_snapshot_store, lazy_download_button, paged_table, read_upload
+)
+from cpro.diff import (
+    CHANGE_ORDER, UNCHANGED, area_delta, change_summary, detect_kind, diff_snapshots, prepare, setup_percentages
+)
+from cpro.ingest import source_digest
+from cpro.snapshots import TREND_DIMENSIONS, date_from_name, missing_columns
+
+profiler = current_profiler()
+
+st.title("📈 Komparasi Progress")
+
+tab_compare, tab_trend = st.tabs(["🔁 Before vs After", "📅 Tren Harian"])
+
+with tab_compare:
+    col1, col2 = st.columns(2)
+    with col1:
+        file_before = st.file_uploader("Upload Excel Hari ke-1 (Before)", type=["xlsx"])
+    with col2:
+        file_after = st.file_uploader("Upload Excel Hari ke-2 (After)", type=["xlsx"])
+
+    if file_before and file_after:
+        # Baca semua data
+        df_before_all = read_upload(file_before)
+        df_after_all = read_upload(file_after)
+
+        kind = detect_kind(df_before_all)
+        if kind is None or detect_kind(df_after_all) != kind:
+            st.error(
+                "⚠️ Kedua file harus berformat sama: hasil Monitoring Setup User (kolom Status) "
+                "atau WPProgress (kolom STATUS)."
+            )
+            kind = None
+
+        if kind == "setup":
+            # Persentase Sudah Setup sebelum vs sesudah
+            df_compare = setup_percentages(df_before_all, df_after_all)
+            persen_before, persen_after = df_compare["Persentase"]
+
+            # Plot horizontal bar (grouped)
+            fig = px.bar(
+                df_compare,
+                y=["Sudah Setup"] * len(df_compare),  # hanya 1 kategori
+                x="Persentase",
+                color="Waktu",
+                orientation="h",
+                barmode="group",
+                text="Persentase",
+                title="📊 Komparasi Progress Sudah Setup"
+            )
+
+            # Tambah anotasi perubahan
+            perubahan = persen_after - persen_before
+            fig.add_annotation(
+                x=persen_after + 1,
+                y="Sudah Setup",
+                text=f"{perubahan:+.2f}%",
+                showarrow=False,
+                font=dict(color="yellow", size=12)
+            )
+
+            fig.update_traces(texttemplate='%{text:.2f}%', textposition="inside")
+            fig.update_layout(xaxis_title="Persentase (%)", yaxis_title="Status")
+
+            # Tampilkan chart
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Tampilkan tabel ringkas
+            st.dataframe(df_compare)
+
+        if kind is not None:
+            # ---------- PERUBAHAN PER BARIS (DIFF BERKUNCI) ----------
+            st.subheader("🔍 Perubahan per Baris")
+            codebook = get_ci_codebook()
+            prepared_before, diff_keys = profiler.call("diff:prepare", prepare, df_before_all, kind, codebook)
+            prepared_after, _ = profiler.call("diff:prepare", prepare, df_after_all, kind, codebook)
+            delta = profiler.call("diff:join", diff_snapshots, prepared_before, prepared_after, diff_keys)
+            st.caption("Kunci: " + ", ".join(diff_keys))
+
+            col1, col2 = st.columns([1, 2])
+            with col1:
+                st.dataframe(change_summary(delta), use_container_width=True, hide_index=True)
+            with col2:
+                fig_delta = px.bar(
+                    area_delta(delta),
+                    x="AREA", y="JUMLAH", color="PERUBAHAN",
+                    barmode="stack",
+                    title="📍 Perubahan per AREA",
+                    category_orders={"PERUBAHAN": CHANGE_ORDER}
+                )
+                st.plotly_chart(fig_delta, use_container_width=True)
+
+            change_filter = st.multiselect(
+                "Tampilkan perubahan", CHANGE_ORDER, default=[c for c in CHANGE_ORDER if c != UNCHANGED]
+            )
+            delta_view = delta[delta["PERUBAHAN"].isin(change_filter)]
+            paged_table("delta_grid", delta_view)
+            # CSV baru dibuat saat diminta, disimpan per sesi selama file & filter sama
+            lazy_download_button(
+                "delta_export", (source_digest(file_before), source_digest(file_after), tuple(change_filter)),
+                lambda: delta_view.to_csv(index=False).encode("utf-8-sig"),
+                label="📥 Download Delta (CSV)",
+                file_name="delta_progress.csv",
+                mime="text/csv"
+            )
+
+# ---------- TREN HARIAN DARI SNAPSHOT TERSIMPAN ----------
+with tab_trend:
+    store = get_snapshot_store()
+    daily_files = st.file_uploader(
+        "Upload hasil monitoring harian (boleh banyak file, cukup sekali per file)",
+        type=["xlsx"], accept_multiple_files=True
+    )
+
+    # file baru: tanggal dari nama file, atau diisi per file. Satu batch tidak boleh
+    # memakai tanggal yang sama dua kali, dan tanggal yang sudah berisi snapshot
+    # (termasuk dari file lain di upload ini) baru diganti setelah dikonfirmasi.
+    pending, seen = [], set()
+    for f in daily_files or []:
+        digest = source_digest(f)
+        if digest in seen or store.has(digest):
+            continue
+        seen.add(digest)
+        snapshot_date = date_from_name(f.name)
+        if snapshot_date is None:
+            snapshot_date = st.date_input(
+                f"Tanggal snapshot untuk {f.name} (tidak ada tanggal di nama file)",
+                value=datetime.now().date(), key=f"trend_date_{digest}"
+            )
+        pending.append((f, digest, snapshot_date))
+
+    names_by_date = defaultdict(list)
+    for f, _, snapshot_date in pending:
+        names_by_date[snapshot_date].append(f.name)
+    clashes = {d: names for d, names in names_by_date.items() if len(names) > 1}
+    if clashes:
+        st.error(
+            "⚠️ Beberapa file memakai tanggal snapshot yang sama, belum ada yang disimpan. "
+            "Ubah tanggalnya: " + "; ".join(f"{d:%d %b %Y}: {', '.join(names)}" for d, names in sorted(clashes.items()))
+        )
+    else:
+        for f, digest, snapshot_date in pending:
+            existing = store.source_at(snapshot_date)
+            if existing is not None:
+                st.warning(f"⚠️ Tanggal {snapshot_date:%d %b %Y} sudah berisi snapshot {existing}.")
+                if not st.checkbox(f"Ganti dengan {f.name}", key=f"trend_replace_{digest}"):
+                    continue
+            df_daily = read_upload(f)
+            missing = missing_columns(df_daily)
+            if missing:
+                st.error(
+                    f"❌ {f.name} tidak disimpan: kolom {', '.join(missing)} tidak ada "
+                    "(bukan hasil Monitoring Setup User?)"
+                )
+                continue
+            profiler.call(
+                "trend:ingest", store.ingest, df_daily, snapshot_date, digest, source_name=f.name,
+                replace=existing is not None
+            )
+            st.success(f"✅ {f.name} disimpan sebagai snapshot {snapshot_date:%d %b %Y}")
+
+    snapshots = store.snapshots()
+    if snapshots.empty:
+        st.info("Belum ada snapshot tersimpan. Upload file hasil monitoring harian di atas.")
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            n_days = (
+                st.slider("Jumlah snapshot terakhir", 1, len(snapshots), min(90, len(snapshots)))
+                if len(snapshots) > 1 else 1
+            )
+        with col2:
+            breakdown = st.selectbox("Breakdown", list(TREND_DIMENSIONS))
+        by = TREND_DIMENSIONS[breakdown]
+
+        trend = profiler.call("trend:query", store.trend, by=by, days=n_days)
+        if by:
+            # batasi pilihan supaya grafik tetap terbaca
+            options = sorted(trend[by].dropna().unique())
+            chosen = st.multiselect(f"Pilih {breakdown[4:]}", options, default=options[:10])
+            trend = trend[trend[by].isin(chosen)]
+
+        fig_trend = px.line(
+            trend, x="TANGGAL", y="Persentase", color=by, markers=True,
+            title="📈 Tren Persentase Sudah Setup",
+            labels={"Persentase": "Persentase (%)", "TANGGAL": "Tanggal"}
+        )
+        st.plotly_chart(fig_trend, use_container_width=True)
+        st.dataframe(trend, use_container_width=True)
+
+        with st.expander("🗄️ Snapshot tersimpan"):
+            st.dataframe(snapshots, use_container_width=True)
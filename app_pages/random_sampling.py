@@ -0,0 +1,155 @@
+# Random Sampling dari Excel (mode Network & Central), tanpa grafik
+import io
+
+import streamlit as st
+
+from app_common import current_profiler, get_job_manager, job_result, paged_table, read_upload, read_upload_preview
+from cpro.ingest import iter_table_chunks, source_digest
+from cpro.sampling import (
+    ALLOCATION_METHODS, DEFAULT_CAP, DEFAULT_SEED, sample_with_mapping, stratified_sample, stream_stratified_sample
+)
+
+profiler = current_profiler()
+
+st.subheader("📥 Random Sampling dari Excel")
+fungsi = st.radio("🔧 Pilih Mode:", ["Network", "Central"])
+
+# Mode streaming: file dibaca per potongan, cocok untuk file yang terlalu besar untuk dimuat utuh
+streaming = fungsi == "Network" and st.toggle(
+    "🌊 Mode streaming (file sangat besar)",
+    help="File dibaca per potongan; memori hanya sebesar sample. Hasil sama dengan mode biasa untuk seed yang sama."
+)
+
+# Upload file utama
+uploaded_file = st.file_uploader("📝 Upload file utama:", type=["xlsx", "csv"] if streaming else ["xlsx"])
+
+if uploaded_file:
+    if streaming:
+        df = read_upload_preview(uploaded_file)
+        st.success("✅ Header file utama terbaca (isi dibaca saat sampling)")
+    else:
+        df = read_upload(uploaded_file)
+        st.success("✅ File utama berhasil dimuat!")
+    st.dataframe(df.head())
+
+    # =======================
+    # MODE NETWORK
+    # =======================
+    if fungsi == "Network":
+        st.info("📡 Mode: Network")
+        branch_col = st.selectbox("🏢 Pilih kolom Cabang:", df.columns)
+
+        # Opsional: pakai periode
+        use_period = st.checkbox("📅 Gunakan periode?")
+        if use_period:
+            period_col = st.selectbox("Pilih kolom Periode:", df.columns)
+            if streaming:
+                # nilai periode belum diketahui tanpa membaca seluruh file: batas diisi manual
+                col1, col2 = st.columns(2)
+                with col1:
+                    min_period = st.text_input("Periode dari (kosong = tanpa batas)").strip() or None
+                with col2:
+                    max_period = st.text_input("Periode sampai (kosong = tanpa batas)").strip() or None
+            else:
+                min_period, max_period = st.select_slider(
+                    "Range Periode:",
+                    options=sorted(df[period_col].unique()),
+                    value=(df[period_col].min(), df[period_col].max())
+                )
+                df = df[df[period_col].between(min_period, max_period)]
+
+        col1, col2 = st.columns(2)
+        with col1:
+            cap = st.number_input("🎯 Maksimal sample per cabang", min_value=1, value=DEFAULT_CAP)
+        with col2:
+            seed = st.number_input("🎲 Seed", min_value=0, value=DEFAULT_SEED)
+
+        # hasil disimpan per sesi selama input sama, supaya pindah halaman tabel tidak menghapusnya
+        params = (
+            source_digest(uploaded_file), branch_col,
+            (period_col, min_period, max_period) if use_period else None, int(cap), int(seed)
+        )
+        if streaming:
+            # file dibaca per potongan di job background; hasil disimpan per kombinasi input
+            job_key = ("sampling_network_stream", params)
+            jobs = get_job_manager()
+            if st.button("🚀 Jalankan Sampling Network"):
+                jobs.submit(
+                    job_key, stream_stratified_sample,
+                    iter_table_chunks(io.BytesIO(uploaded_file.getvalue()), name=uploaded_file.name),
+                    branch_col, cap=int(cap), seed=int(seed), period_col=period_col if use_period else None,
+                    period_min=min_period if use_period else None, period_max=max_period if use_period else None,
+                    label="Sampling Network (streaming)"
+                )
+            job = jobs.get(job_key)
+            sampled_df = job_result(job) if job is not None else None
+            if sampled_df is not None:
+                st.subheader("📄 Hasil Random Sampling (Network)")
+                paged_table("sampling_network_grid", sampled_df, cache_key=params)
+        else:
+            if st.button("🚀 Jalankan Sampling Network"):
+                sampled_df = profiler.call(
+                    "sampling:network", stratified_sample, df, branch_col, cap=int(cap), seed=int(seed)
+                )
+                st.session_state.sampling_network = (params, sampled_df)
+
+            result = st.session_state.get("sampling_network")
+            if result is not None and result[0] == params:
+                st.subheader("📄 Hasil Random Sampling (Network)")
+                paged_table("sampling_network_grid", result[1], cache_key=params)
+
+    # =======================
+    # MODE CENTRAL
+    # =======================
+    elif fungsi == "Central":
+        mapping_file = st.file_uploader("🗂️ Upload file mapping central:", type=["xlsx"])
+        if mapping_file:
+            df_map = read_upload(mapping_file)
+            st.success("✅ Mapping central berhasil dimuat!")
+            st.dataframe(df_map.head())
+
+            central_function = st.selectbox(
+                "🏢 Pilih Function Central:",
+                ["COVER CENTRAL CREDIT", "COVER CENTRAL REMEDIAL", "COVER CENTRAL IWM"]
+            )
+            left_col = st.selectbox("🔑 Pilih kolom penghubung (File Utama):", df.columns)
+            right_col = st.selectbox("🔑 Pilih kolom penghubung (File Mapping):", df_map.columns)
+
+            total_sample = st.number_input("🎯 Total sample per Central", min_value=1, value=30)
+            extra_group_col = st.multiselect("🧩 Tambah kolom untuk group by (opsional):", df.columns)
+            col1, col2 = st.columns(2)
+            with col1:
+                method = st.radio(
+                    "⚖️ Pembagian kuota per cabang:", ALLOCATION_METHODS,
+                    format_func={"even": "Rata", "proportional": "Proporsional jumlah data"}.get,
+                    horizontal=True
+                )
+            with col2:
+                seed = st.number_input("🎲 Seed", min_value=0, value=DEFAULT_SEED)
+
+            params = (
+                source_digest(uploaded_file), source_digest(mapping_file), central_function, left_col, right_col,
+                int(total_sample), tuple(extra_group_col), method, int(seed)
+            )
+            # sampling berjalan di job background; hasil disimpan per kombinasi input
+            job_key = ("sampling_central", params)
+            jobs = get_job_manager()
+            if st.button("🚀 Jalankan Sampling Central"):
+                jobs.submit(
+                    job_key, sample_with_mapping, df, df_map, left_col, right_col, central_function,
+                    int(total_sample), extra_group_cols=extra_group_col, method=method, seed=int(seed),
+                    label=f"Sampling Central ({central_function})"
+                )
+
+            job = jobs.get(job_key)
+            result = job_result(job) if job is not None else None
+            if result is not None:
+                sampled_df, allocation = result
+                if not sampled_df.empty:
+                    st.subheader(f"📄 Hasil Random Sampling (Central - {central_function})")
+                    paged_table("sampling_central_grid", sampled_df, cache_key=params)
+
+                    with st.expander("📋 Laporan Alokasi Kuota"):
+                        st.dataframe(allocation, use_container_width=True)
+                else:
+                    st.warning("⚠️ Tidak ada data yang bisa di-sampling.")
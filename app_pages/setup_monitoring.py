@@ -0,0 +1,137 @@
+# Monitoring Setup User per Branch & LOB
+from datetime import datetime
+
+import plotly.express as px
+import streamlit as st
+
+from app_common import current_profiler, get_setup_monitoring, lazy_download_button, paged_table, read_uploads
+from cpro.export import EXPORT_FORMATS, export_bytes
+from cpro.ingest import source_digest
+from cpro.monitoring import (
+    BRANCH_COLUMNS, REALISASI_COLUMNS, area_summary, load_lob_list, parse_lob_list, status_summary
+)
+
+profiler = current_profiler()
+
+st.title("📊 Monitoring Setup User per Branch & LOB")
+
+# Upload file pertama (data branch)
+file1 = st.file_uploader("Upload File BRANCHLIST (BRANCH_ID, BRANCH_NAME, AREA)", type=["xlsx"])
+# Upload file kedua (data realisasi)
+file2 = st.file_uploader("Upload File Realisasi Setup (BRANCH_ID, LOB, PIC)", type=["xlsx"])
+
+# Daftar LOB bisa diubah (default dari CPRO_LOB_FILE atau bawaan)
+with st.expander("⚙️ Daftar LOB"):
+    lob_text = st.text_area("Satu LOB per baris", value="\n".join(load_lob_list()), height=250)
+lob_list = parse_lob_list(lob_text) or load_lob_list()
+
+if file1 and file2:
+    df_branch, df_real = read_uploads([file1, file2], [BRANCH_COLUMNS, REALISASI_COLUMNS])
+
+    # Pastikan kolom sesuai format
+    df_branch.columns = df_branch.columns.str.strip()
+    df_real.columns = df_real.columns.str.strip()
+
+    # Expand branch × LOB, join realisasi, dan tentukan status (sekali per upload, bersama index filter)
+    upload_keys = (source_digest(file1), source_digest(file2))
+    df_merge, filter_index = profiler.call(
+        "setup:build", get_setup_monitoring, upload_keys, tuple(lob_list), df_branch, df_real
+    )
+
+    # Filter UI - dibuat lebih rapi dengan columns
+    with st.expander("🔍 Filter Data", expanded=True):
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            branch_filter = st.multiselect(
+                "🏢 Filter Branch",
+                options=filter_index.options("BRANCH_NAME"),
+                placeholder="Pilih Branch..."
+            )
+        with col2:
+            AREA_filter = st.multiselect(
+                "🌍 Filter AREA",
+                options=filter_index.options("AREA"),
+                placeholder="Pilih AREA..."
+            )
+        with col3:
+            lob_filter = st.multiselect(
+                "📂 Filter LOB",
+                options=lob_list,
+                placeholder="Pilih LOB..."
+            )
+        with col4:
+            setup_filter = st.multiselect(
+                "Filter Status",
+                options=filter_index.options("Status"),
+                placeholder="Pilih Status..."
+            )
+
+    # Apply filters lewat index: baris lolos dihitung dari posisi, frame hanya diambil sekali
+    with profiler.stage("setup:filter", len(df_merge)) as record:
+        rows = filter_index.rows({
+            "BRANCH_NAME": branch_filter or None,
+            "AREA": AREA_filter or None,
+            "LINE_OF_BUSINESS": lob_filter or None,
+            "Status": setup_filter or None,
+        })
+        filtered_df = filter_index.take(df_merge, rows)
+        record["rows_out"] = len(filtered_df)
+
+    # Summary untuk plot
+    AREA_summary = profiler.call("setup:area_summary", area_summary, filtered_df)
+
+    # Grafik bar stacked
+    with profiler.stage("plot:area_bar", len(AREA_summary)):
+        fig_bar = px.bar(
+            AREA_summary,
+            x="AREA",
+            y="Count",
+            color="Status",
+            orientation="v",
+            barmode="stack",
+            title="📍 Grafik Status per AREA (Stacked)",
+            labels={"Count": "Jumlah", "AREA": "Area"}
+        )
+        st.plotly_chart(fig_bar, use_container_width=True)
+
+    st.subheader("📋 Tabel Data Hasil Setup")
+    paged_table("monitoring_grid", filtered_df)
+
+    # Grafik Pie total status
+    status_counts = profiler.call("setup:status_summary", status_summary, filtered_df)
+
+    with profiler.stage("plot:status_pie", len(status_counts)):
+        fig_pie = px.pie(
+            status_counts,
+            values="Count",
+            names="Status",
+            color="Status",
+            color_discrete_map={"Sudah Setup": "#00CC22", "Belum Setup": "#EF3B3B"},
+            hole=0.4,
+            title="Distribusi Status Setup Keseluruhan"
+        )
+        fig_pie.update_traces(textinfo="percent+label")
+        st.plotly_chart(fig_pie, use_container_width=True)
+
+    # Export: file baru dibuat saat diminta, dan dipakai ulang selama filter sama
+    export_fmt = st.radio(
+        "Format export", list(EXPORT_FORMATS),
+        format_func=lambda f: EXPORT_FORMATS[f][0], horizontal=True
+    )
+    _, ext, mime = EXPORT_FORMATS[export_fmt]
+    export_key = (
+        *upload_keys, tuple(lob_list),
+        tuple(branch_filter), tuple(AREA_filter), tuple(lob_filter), tuple(setup_filter), export_fmt
+    )
+    today_str = datetime.now().strftime("%d%b%Y")
+    lazy_download_button(
+        "monitoring_export", export_key,
+        lambda: export_bytes(export_fmt, {
+            "Filtered Data": filtered_df,
+            "Summary Area": AREA_summary,
+            "Summary Status": status_counts,
+        }),
+        label=f"📥 Download Hasil Monitoring ({ext})",
+        file_name=f"hasil_monitoring{today_str}{ext}",
+        mime=mime
+    )
@@ -0,0 +1,195 @@
+# Monitoring WP Progress
+import plotly.express as px
+import streamlit as st
+
+from app_common import current_profiler, job_result, lazy_download_button, paged_table, read_uploads, submit_wp_engine
+from cpro.export import csv_file_from_chunks
+from cpro.ingest import source_digest
+from cpro.wp_progress import DESIRED_COLS, INPUT_COLUMNS
+
+profiler = current_profiler()
+
+st.title("🗂 WPProgress Reporting")
+
+# Upload files
+branch_file = st.file_uploader("Upload Branch Excel", type=["xlsx"])
+wp_file = st.file_uploader("Upload WP Excel", type=["xlsx"])
+progress_file = st.file_uploader("Upload WPProgress Excel", type=["xlsx"])
+
+if branch_file and wp_file and progress_file:
+    # Load data
+    df_branch, df_wp, df_progress = read_uploads([branch_file, wp_file, progress_file], INPUT_COLUMNS)
+
+    st.subheader("Preview Data")
+    st.write("Branch", df_branch.head())
+    st.write("WP", df_wp.head())
+    st.write("WPProgress", df_progress.head())
+
+    # --- Engine WP Progress (tanpa cross join penuh Branch × WP) ---
+    partitioned = st.toggle(
+        "💾 Proses per AREA (hemat memori)",
+        help="Baris hasil disimpan sementara ke disk per AREA; memori hanya sebesar AREA terbesar."
+    )
+    upload_keys = tuple(source_digest(f) for f in (branch_file, wp_file, progress_file))
+    # dibangun di job background: rerun selama proses cukup menampilkan progress
+    engine_job = submit_wp_engine(upload_keys, partitioned, df_branch, df_wp, df_progress)
+    engine = job_result(engine_job)
+    if engine is None:
+        if engine_job.done and st.button("🔁 Proses ulang"):
+            submit_wp_engine(upload_keys, partitioned, df_branch, df_wp, df_progress, restart=True)
+            st.rerun()
+        st.stop()
+    for code, texts in engine.ci_collisions.items():
+        st.warning(f"⚠️ {code} dipakai oleh {len(texts)} COMPLIANCE_INDICATOR berbeda: " + " | ".join(texts))
+
+    # ---------- INIT SESSION STATE ----------
+    if "selected_area" not in st.session_state:
+        st.session_state.selected_area = engine.area_options()
+
+    if "selected_lob" not in st.session_state:
+        st.session_state.selected_lob = engine.lob_options()
+
+    # ---------- FILTER UI ----------
+    st.subheader("Filter Data")
+
+    with st.form("filter_form"):
+        col1, col2 = st.columns(2)
+
+        # --- Area ---
+        area_options = engine.area_options()
+        valid_area = [x for x in st.session_state.selected_area if x in area_options]
+
+        selected_area = st.multiselect(
+            "Pilih Area",
+            options=area_options,
+            default=valid_area,
+        )
+
+        # --- LOB (dependent on Area) ---
+        lob_options = engine.lob_options(selected_area)
+        valid_lob = [x for x in st.session_state.selected_lob if x in lob_options]
+
+        selected_lob = st.multiselect(
+            "Pilih Line of Business",
+            options=lob_options,
+            default=valid_lob,
+        )
+
+        apply_filter = st.form_submit_button("✅ Apply Filter")
+
+    # Tombol reset di luar form
+    reset_filter = st.button("🔄 Reset Filter")
+
+    # --- Logic tombol ---
+    if apply_filter:
+        st.session_state.selected_area = selected_area
+        st.session_state.selected_lob = selected_lob
+
+    if reset_filter:
+        st.session_state.selected_area = area_options
+        st.session_state.selected_lob = engine.lob_options()
+        apply_filter = True  # langsung tampilkan semua data
+
+    # hasil tetap tampil di rerun berikutnya (mis. pindah halaman tabel) sampai upload berganti
+    if apply_filter:
+        st.session_state.wp_applied = upload_keys
+    apply_filter = st.session_state.get("wp_applied") == upload_keys
+
+    # ---------- FILTERING ----------
+    areas = st.session_state.selected_area
+    lobs = st.session_state.selected_lob
+    if apply_filter:
+        filtered_count = profiler.call("wp:count", engine.count, areas, lobs)
+
+        st.subheader("Hasil Gabungan (Kolom Terpilih)")
+        # baris dibentuk per potongan dari engine; hanya halaman yang dilihat dikirim ke browser
+        paged_table(
+            "wp_grid", lambda: engine.iter_rows(areas, lobs), columns=DESIRED_COLS,
+            total=filtered_count, cache_key=(upload_keys, partitioned, tuple(areas), tuple(lobs))
+        )
+
+    else:
+        st.info("Pilih filter lalu klik **Apply Filter** untuk menampilkan data.")
+        filtered_count = 0
+
+        # ---------- GRAFIK ----------
+        # 1) Jumlah Status Submit
+    if filtered_count:
+        status_counts = profiler.call("wp:status_counts", engine.status_counts, areas, lobs)
+        fig_pie = px.pie(
+            status_counts,
+            names="STATUS", values="JUMLAH",
+            title="Distribusi Status Submit",
+            hole=0.3
+        )
+
+        # 2) Rata-rata SCORE per LOB
+        score_avg = profiler.call("wp:score_by_lob", engine.score_by_lob, areas, lobs)
+        fig_bar = px.bar(
+            score_avg,
+            x="LINE_OF_BUSINESS", y="SCORE", color="LINE_OF_BUSINESS",
+            title="Rata-rata Nilai (SCORE) per Line of Business",
+            text_auto=True
+        )
+        fig_bar.update_layout(xaxis_tickangle=-45)
+
+        col1, col2 = st.columns(2)
+        with profiler.stage("plot:status_score"):
+            with col1:
+                st.plotly_chart(fig_pie, use_container_width=True)
+            with col2:
+                st.plotly_chart(fig_bar, use_container_width=True)
+
+        # 3) Stacked bar per AREA
+        area_progress = profiler.call("wp:area_progress", engine.area_progress, areas, lobs)
+        with profiler.stage("plot:area_progress", len(area_progress)):
+            fig_area = px.bar(
+                area_progress,
+                x="AREA", y="Persentase",
+                title="Persentase Pengerjaan per Area (Filtered)",
+                text="Persentase",
+                color="Persentase",
+                color_continuous_scale="Blues"
+            )
+            fig_area.update_traces(texttemplate="%{text:.1f}%", textposition="outside")
+
+            st.plotly_chart(fig_area, use_container_width=True, key="area_progress_chart")
+
+        # ---------- TABEL PROGRESS PER BRANCH ----------
+    if filtered_count:
+        branch_progress = profiler.call("wp:branch_progress", engine.branch_progress, areas, lobs)
+
+        st.subheader("📊 Progress Pengerjaan per Branch")
+
+        # Styling function
+        def highlight_progress(val):
+            if val == 100:
+                color = 'background-color: green; color: black; font-weight: bold;'
+            elif val >= 50:
+                color = 'background-color: orange; color: white;'
+            else:
+                color = 'background-color: red; color: white;'
+            return color
+
+        styled_table = branch_progress.style.applymap(
+            highlight_progress, subset=["Persentase (%)"]
+        ).format({"Persentase (%)": "{:.0f}%"})
+
+        with profiler.stage("render:branch_table", len(branch_progress)):
+            st.dataframe(styled_table, use_container_width=True)
+        # ---------- DOWNLOAD ----------
+    # CSV dibuat di memori per sesi saat diminta (bukan file bersama di disk)
+    # filter export = filter yang sedang dipakai tabel; sebelum Apply Filter belum ada filter apa pun
+    if apply_filter:
+        export_all = st.checkbox("Export semua data (tanpa filter)")
+    else:
+        export_all = True
+        st.caption("Filter belum diterapkan, export berisi semua data.")
+    export_areas, export_lobs = (None, None) if export_all else (areas, lobs)
+    lazy_download_button(
+        "wp_export", (upload_keys, partitioned, export_all) + (() if export_all else (tuple(areas), tuple(lobs))),
+        lambda: csv_file_from_chunks(engine.iter_rows(export_areas, export_lobs), DESIRED_COLS),
+        label="Download Hasil Gabungan (CSV)",
+        file_name="hasil_gabungan.csv",
+        mime="text/csv"
+    )
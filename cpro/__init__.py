@@ -0,0 +1 @@
+# Engine C-PRO: logika halaman app.py yang bisa dipakai ulang di luar Streamlit.
@@ -0,0 +1,92 @@
+# CLI batch: python -m cpro <job> INPUT... -o OUTPUT_DIR [opsi]
+#
+# INPUT boleh file, glob, atau folder (dicari rekursif untuk *.xlsx / *.csv).
+# Setiap input diproses di process pool; ringkasan ada di batch_summary.json.
+import argparse
+import sys
+
+from cpro.batch import check_output_names, collect_inputs, run_batch
+from cpro.export import EXPORT_FORMATS
+from cpro.ingest import DEFAULT_STREAM_ROWS
+from cpro.sampling import ALLOCATION_METHODS, DEFAULT_CAP, DEFAULT_SEED
+from cpro.wp_partition import DEFAULT_PARTITION_BRANCHES
+
+CENTRAL_FUNCTIONS = ["COVER CENTRAL CREDIT", "COVER CENTRAL REMEDIAL", "COVER CENTRAL IWM"]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m cpro", description="Batch C-Pro tanpa Streamlit.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("inputs", nargs="+", help="file, glob, atau folder")
+    common.add_argument("-o", "--out", required=True, help="folder output")
+    common.add_argument("-w", "--workers", type=int, default=None, help="jumlah proses (default: jumlah core)")
+    export = argparse.ArgumentParser(add_help=False)
+    export.add_argument("--format", dest="fmt", choices=list(EXPORT_FORMATS), default="xlsx")
+
+    jobs = parser.add_subparsers(dest="job", required=True)
+
+    p = jobs.add_parser("setup", parents=[common, export], help="Monitoring Setup User (input: file realisasi)")
+    p.add_argument("--branch", required=True, help="file Branch")
+    p.add_argument("--lob-file", default=None, help="daftar LOB (default: CPRO_LOB_FILE / bawaan)")
+
+    p = jobs.add_parser("network", parents=[common, export], help="Random sampling mode Network")
+    p.add_argument("--branch-col", required=True)
+    p.add_argument("--cap", type=int, default=DEFAULT_CAP)
+    p.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    p.add_argument("--period-col", default=None)
+    p.add_argument("--period-min", default=None)
+    p.add_argument("--period-max", default=None)
+    p.add_argument("--stream", action="store_true",
+                   help="baca file per potongan, memori sebesar sample (untuk file yang terlalu besar)")
+    p.add_argument("--chunk-rows", type=int, default=DEFAULT_STREAM_ROWS, help="baris per potongan untuk --stream")
+
+    p = jobs.add_parser("central", parents=[common, export], help="Random sampling mode Central")
+    p.add_argument("--mapping", required=True, help="file mapping central")
+    p.add_argument("--function", dest="functions", action="append", choices=CENTRAL_FUNCTIONS,
+                   help="boleh diulang (default: semua function)")
+    p.add_argument("--left-col", required=True, help="kolom penghubung di file utama")
+    p.add_argument("--right-col", required=True, help="kolom penghubung di file mapping")
+    p.add_argument("--total", dest="total_sample", type=int, default=30, help="total sample per central")
+    p.add_argument("--group-col", dest="group_cols", action="append", default=[])
+    p.add_argument("--method", choices=ALLOCATION_METHODS, default="even")
+    p.add_argument("--seed", type=int, default=DEFAULT_SEED)
+
+    p = jobs.add_parser("wp", parents=[common], help="Merge WP Progress ke CSV (input: file WPProgress)")
+    p.add_argument("--branch", required=True, help="file Branch")
+    p.add_argument("--wp", required=True, help="file WP")
+    p.add_argument("--partition", choices=["area", "branch"], default=None,
+                   help="proses per AREA / potongan branch dengan spill Parquet (hemat memori)")
+    p.add_argument("--partition-size", type=int, default=DEFAULT_PARTITION_BRANCHES,
+                   help="maksimal branch per partisi")
+    p.add_argument("--partition-workers", type=int, default=1, help="proses paralel per file untuk partisi")
+
+    p = jobs.add_parser("compare", parents=[common], help="Komparasi progress (input: file sesudah)")
+    p.add_argument("--before", required=True, help="file atau folder 'sebelum' (nama relatif sama)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = vars(parser.parse_args(argv))
+    job, out_dir, workers = args.pop("job"), args.pop("out"), args.pop("workers")
+    try:
+        inputs = collect_inputs(args.pop("inputs"))
+        check_output_names(inputs)
+    except (FileNotFoundError, ValueError) as exc:
+        parser.error(str(exc))
+    if job == "central" and not args["functions"]:
+        args["functions"] = CENTRAL_FUNCTIONS
+
+    def report(result):
+        line = f"[{result['status']}] {result['input']} ({result['seconds']}s)"
+        if result["status"] != "ok":
+            line += f" - {result['error']}"
+        print(line, file=sys.stderr)
+
+    summary = run_batch(job, inputs, out_dir, options=args, workers=workers, progress=report)
+    print(f"{summary['files']} file, {summary['failed']} gagal, {summary['seconds']}s -> {out_dir}", file=sys.stderr)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
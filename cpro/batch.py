@@ -0,0 +1,250 @@
+# Batch headless: pipeline halaman app.py untuk banyak workbook sekaligus.
+#
+# Setiap file input menjadi satu task yang dijalankan di process pool (satu
+# proses per core). Fungsi job di sini memakai engine yang sama dengan app.py,
+# jadi hasil batch malam dan hasil di browser selalu sama.
+import glob
+import json
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from cpro.diff import area_delta, change_summary, detect_kind, diff_snapshots, prepare, setup_percentages
+from cpro.export import EXPORT_FORMATS, export_bytes, iter_csv
+from cpro.ingest import DEFAULT_STREAM_ROWS, UploadCache, iter_table_chunks, read_csv_columns
+from cpro.monitoring import (
+    BRANCH_COLUMNS, REALISASI_COLUMNS, area_summary, build_setup_monitoring, load_lob_list, status_summary
+)
+from cpro.sampling import (
+    DEFAULT_CAP, DEFAULT_SEED, central_sample, drop_mapping_columns, period_mask, stratified_sample,
+    stream_stratified_sample
+)
+from cpro.wp_partition import DEFAULT_PARTITION_BRANCHES, PartitionedWP
+from cpro.wp_progress import DESIRED_COLS, INPUT_COLUMNS, WPProgressEngine
+
+INPUT_SUFFIXES = (".xlsx", ".csv")
+SUMMARY_FILE = "batch_summary.json"
+
+_cache = None
+
+
+def read_table(path, columns=None):
+    """Baca workbook/CSV (hanya `columns` kalau diberikan); xlsx lewat UploadCache per proses."""
+    global _cache
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        return read_csv_columns(path, columns) if columns else pd.read_csv(path)
+    if _cache is None:
+        _cache = UploadCache.from_env()
+    return _cache.read_excel(path, columns=columns)
+
+
+def collect_inputs(patterns):
+    """File, glob, atau folder (dicari rekursif) -> daftar (path, nama relatif)."""
+    found = {}
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            for suffix in INPUT_SUFFIXES:
+                for f in path.rglob(f"*{suffix}"):
+                    if not f.name.startswith("~$"):
+                        found.setdefault(f.resolve(), f.relative_to(path))
+        else:
+            for match in sorted(glob.glob(pattern, recursive=True)) or [pattern]:
+                f = Path(match)
+                if not f.is_file():
+                    raise FileNotFoundError(f"Input tidak ditemukan: {pattern}")
+                found.setdefault(f.resolve(), Path(f.name))
+    return sorted(found.items(), key=lambda item: str(item[1]))
+
+
+def output_stem(relative):
+    # folder_cabang/data.xlsx -> folder_cabang__data
+    return "__".join(Path(relative).with_suffix("").parts)
+
+
+def output_name(relative, tag, ext):
+    return f"{output_stem(relative)}_{tag}{ext}"
+
+
+def check_output_names(inputs):
+    """ValueError kalau dua input akan menulis file output yang sama.
+
+    Nama relatif hanya unik di dalam satu folder input, dan ekstensi tidak ikut
+    nama output (tx.xlsx dan tx.csv sama-sama tx_<tag>), jadi bentrokan dicek
+    sebelum ada job yang dijalankan supaya output tidak saling menimpa.
+    """
+    owners = defaultdict(list)
+    for source, relative in inputs:
+        owners[output_stem(relative)].append(str(source))
+    clashes = {stem: sources for stem, sources in owners.items() if len(sources) > 1}
+    if clashes:
+        raise ValueError(
+            "Beberapa input menghasilkan nama output yang sama: "
+            + "; ".join(f"{stem} <- {', '.join(sources)}" for stem, sources in sorted(clashes.items()))
+            + ". Jalankan terpisah atau ganti nama file/folder."
+        )
+
+
+def _write_sheets(target, fmt, sheets):
+    Path(target).write_bytes(export_bytes(fmt, sheets))
+    return [str(target)]
+
+
+# ---------- job per halaman ----------
+def setup_job(source, out_dir, relative, branch, lob_file=None, fmt="xlsx"):
+    df_merge = build_setup_monitoring(
+        read_table(branch, BRANCH_COLUMNS), read_table(source, REALISASI_COLUMNS), load_lob_list(lob_file)
+    )
+    target = Path(out_dir) / output_name(relative, "monitoring", EXPORT_FORMATS[fmt][1])
+    return _write_sheets(target, fmt, {
+        "Filtered Data": df_merge,
+        "Summary Area": area_summary(df_merge),
+        "Summary Status": status_summary(df_merge),
+    })
+
+
+def network_job(source, out_dir, relative, branch_col, cap=DEFAULT_CAP, seed=DEFAULT_SEED,
+                period_col=None, period_min=None, period_max=None, stream=False, chunk_rows=DEFAULT_STREAM_ROWS,
+                fmt="xlsx"):
+    if stream:
+        # file dibaca per potongan; yang tersimpan hanya reservoir sample per cabang
+        sampled = stream_stratified_sample(
+            iter_table_chunks(source, chunk_rows=chunk_rows), branch_col, cap=cap, seed=seed,
+            period_col=period_col, period_min=period_min, period_max=period_max,
+        )
+    else:
+        df = read_table(source)
+        if period_col:
+            df = df[period_mask(df[period_col], period_min, period_max)]
+        sampled = stratified_sample(df, branch_col, cap=cap, seed=seed)
+    target = Path(out_dir) / output_name(relative, "sample_network", EXPORT_FORMATS[fmt][1])
+    return _write_sheets(target, fmt, {"Sample": sampled})
+
+
+def central_job(source, out_dir, relative, mapping, functions, left_col, right_col, total_sample,
+                group_cols=(), method="even", seed=DEFAULT_SEED, fmt="xlsx"):
+    merged = read_table(source).merge(read_table(mapping), left_on=left_col, right_on=right_col, how="left")
+    written = []
+    for function in functions:
+        sampled, allocation = central_sample(
+            merged, function, total_sample, extra_group_cols=list(group_cols), method=method, seed=seed
+        )
+        tag = "sample_" + function.lower().replace(" ", "_")
+        target = Path(out_dir) / output_name(relative, tag, EXPORT_FORMATS[fmt][1])
+        written += _write_sheets(target, fmt, {
+            "Sample": drop_mapping_columns(sampled),
+            "Alokasi Kuota": allocation,
+        })
+    return written
+
+
+def wp_job(source, out_dir, relative, branch, wp, partition=None, partition_size=DEFAULT_PARTITION_BRANCHES,
+           partition_workers=1):
+    # partition="area"/"branch": diproses per partisi dengan spill Parquet (lihat wp_partition.py)
+    frames = [read_table(path, INPUT_COLUMNS) for path in (branch, wp, source)]
+    if partition:
+        engine = PartitionedWP(*frames, by="AREA" if partition == "area" else None,
+                               max_branches=partition_size, workers=partition_workers)
+    else:
+        engine = WPProgressEngine(*frames)
+    target = Path(out_dir) / output_name(relative, "wp_progress", ".csv")
+    try:
+        with open(target, "wb") as fh:
+            for part in iter_csv(engine.iter_rows(), DESIRED_COLS):
+                fh.write(part)
+    finally:
+        if partition:
+            engine.close()
+    return [str(target)]
+
+
+def compare_job(source, out_dir, relative, before):
+    # `before` boleh folder: file "sebelum" dicari dengan nama relatif yang sama
+    if Path(before).is_dir():
+        before = Path(before) / relative
+    df_before_all, df_after_all = read_table(before), read_table(source)
+    kind = detect_kind(df_before_all)
+    if kind is None or detect_kind(df_after_all) != kind:
+        raise ValueError("Kedua file harus berformat sama (Monitoring Setup User atau WPProgress).")
+
+    prepared_before, keys = prepare(df_before_all, kind)
+    prepared_after, _ = prepare(df_after_all, kind)
+    delta = diff_snapshots(prepared_before, prepared_after, keys)
+    sheets = {"Delta": delta, "Ringkasan": change_summary(delta), "Per Area": area_delta(delta)}
+    if kind == "setup":
+        sheets["Persentase"] = setup_percentages(df_before_all, df_after_all)
+    target = Path(out_dir) / output_name(relative, "komparasi", ".xlsx")
+    return _write_sheets(target, "xlsx", sheets)
+
+
+JOBS = {
+    "setup": setup_job,
+    "network": network_job,
+    "central": central_job,
+    "wp": wp_job,
+    "compare": compare_job,
+}
+
+
+# ---------- runner ----------
+def _run_one(job, source, relative, out_dir, options):
+    # top-level supaya bisa di-pickle ke worker
+    started = time.perf_counter()
+    result = {"input": str(source), "job": job}
+    try:
+        result["outputs"] = JOBS[job](source, out_dir, relative, **options)
+        result["status"] = "ok"
+    except Exception as exc:  # satu file gagal tidak menghentikan batch
+        result["status"] = "error"
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run_batch(job, inputs, out_dir, options=None, workers=None, progress=None):
+    """Jalankan `job` untuk setiap (path, nama relatif) di `inputs` secara paralel.
+
+    Ringkasan per file ditulis ke `out_dir/batch_summary.json` dan dikembalikan.
+    `workers=1` menjalankan semuanya di proses ini (berguna untuk debugging).
+    Input yang nama output-nya bentrok ditolak sebelum ada job yang jalan.
+    """
+    check_output_names(inputs)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    options = options or {}
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+
+    results = []
+    if workers == 1 or len(inputs) <= 1:
+        for source, relative in inputs:
+            results.append(_run_one(job, str(source), relative, str(out_dir), options))
+            if progress:
+                progress(results[-1])
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(inputs))) as pool:
+            futures = [
+                pool.submit(_run_one, job, str(source), relative, str(out_dir), options)
+                for source, relative in inputs
+            ]
+            for future in as_completed(futures):
+                results.append(future.result())
+                if progress:
+                    progress(results[-1])
+
+    results.sort(key=lambda r: r["input"])
+    summary = {
+        "job": job,
+        "workers": workers,
+        "files": len(results),
+        "failed": sum(r["status"] != "ok" for r in results),
+        "seconds": round(time.perf_counter() - started, 3),
+        "results": results,
+    }
+    (out_dir / SUMMARY_FILE).write_text(json.dumps(summary, indent=2, ensure_ascii=False))
+    return summary
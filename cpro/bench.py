@@ -0,0 +1,265 @@
+# Benchmark pipeline C-Pro per tahap, dengan data sintetis (lihat synthetic.py).
+#
+#   python -m cpro.bench --scale s m -o bench.json
+#   python -m cpro.bench --branches 1000 --tx 1000 50000 --compare bench_lama.json
+#   python -m cpro.bench --startup --no-pipeline   (cold start per halaman app)
+#
+# Setiap tahap dicatat waktu (detik), puncak alokasi tracemalloc (MB) dan jumlah
+# baris masuk/keluar (kosong kalau hasilnya bukan tabel, mis. bytes export).
+# Hasilnya JSON supaya bisa dibandingkan antar commit.
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cpro.ci_codes import CICodeBook
+from cpro.export import csv_file_from_chunks, export_bytes, write_excel
+from cpro.filter_index import FilterIndex
+from cpro.monitoring import DEFAULT_LOB_LIST, FILTER_COLUMNS, area_summary, build_setup_monitoring, status_summary
+from cpro.sampling import central_sample, stratified_sample
+from cpro.synthetic import generate, load_templates
+from cpro.wp_progress import DESIRED_COLS, WPProgressEngine
+
+# nama -> (jumlah branch, (min, max) transaksi per branch)
+# perkiraan baris transaksi: s 100 rb, m ±3 juta (±300 MB), l ±15 juta (±1,5 GB DataFrame,
+# ±2,4 GB RSS baru untuk generate; seluruh tahap butuh beberapa GB RAM dan beberapa menit)
+SCALES = {
+    "s": (100, (1_000, 1_000)),
+    "m": (1_000, (1_000, 5_000)),
+    "l": (5_000, (1_000, 5_000)),
+}
+EXCEL_ROW_LIMIT = 50_000  # file xlsx besar ditulis sampai batas ini saja
+
+APP_DIR = Path(__file__).resolve().parent.parent
+APP_PAGES = ["file_repository", "setup_monitoring", "random_sampling", "komparasi_progress", "wp_progress"]
+HEAVY_MODULES = ["pandas", "pyarrow", "plotly.express", "requests", "xlsxwriter", "openpyxl"]
+# dijalankan di proses baru per halaman: waktu rerun pertama + modul berat yang ter-import
+_STARTUP_PROBE = textwrap.dedent("""
+    import json, sys, time
+    from streamlit.testing.v1 import AppTest
+    before = set(sys.modules)
+    at = AppTest.from_file({app!r}, default_timeout=600)
+    at.switch_page({page!r})
+    started = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - started
+    print(json.dumps({{
+        "seconds": elapsed,
+        "heavy": [m for m in {heavy!r} if m in sys.modules and m not in before],
+        "errors": [e.message for e in at.exception],
+    }}))
+""")
+
+
+def _rows(value):
+    if isinstance(value, tuple):
+        value = value[0]
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return len(value) if isinstance(value, (pd.DataFrame, pd.Series)) else None
+
+
+def measure(results, scale, stage, func, rows_in=None, repeat=1):
+    """Jalankan `func` `repeat` kali untuk waktu terbaik, lalu sekali lagi di bawah
+    tracemalloc untuk puncak memori (tracemalloc memperlambat kode Python murni,
+    jadi tidak dipakai saat mengukur waktu)."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        value = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+        del value  # hasil putaran sebelumnya jangan ikut terhitung
+
+    tracemalloc.start()
+    value = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    results.append({
+        "scale": scale,
+        "stage": stage,
+        "seconds": round(best, 4),
+        "peak_mb": round(peak / 2 ** 20, 2),
+        "rows_in": rows_in,
+        "rows_out": _rows(value),
+    })
+    return value
+
+
+def _excel_files(data, folder):
+    files = {}
+    for name, df in data.items():
+        path = Path(folder) / f"{name}.xlsx"
+        write_excel({"Sheet1": df.head(EXCEL_ROW_LIMIT)}, path)
+        files[name] = path
+    return files
+
+
+def run_scale(scale, n_branches, per_branch, seed=0, repeat=1, excel=True, templates=None):
+    results = []
+    data = generate(n_branches, per_branch, seed=seed, templates=templates)
+    branch, wp, progress, tx = data["branch"], data["wp"], data["progress"], data["transactions"]
+
+    def m(stage, func, rows_in=None):
+        return measure(results, scale, stage, func, rows_in, repeat)
+
+    if excel:
+        with tempfile.TemporaryDirectory() as folder:
+            files = _excel_files(data, folder)
+            for name, path in files.items():
+                m(f"excel_read:{name}", lambda path=path: pd.read_excel(path),
+                  min(len(data[name]), EXCEL_ROW_LIMIT))
+
+    setup = m("setup:branch_lob_expand",
+              lambda: build_setup_monitoring(branch, data["realisasi"], DEFAULT_LOB_LIST),
+              len(branch) * len(DEFAULT_LOB_LIST))
+    m("setup:aggregate", lambda: (area_summary(setup), status_summary(setup)), len(setup))
+    index = m("setup:filter_index", lambda: FilterIndex(setup, FILTER_COLUMNS), len(setup))
+    # filter tipikal: separuh area × 3 LOB × satu status
+    setup_filters = {
+        "AREA": index.options("AREA")[::2], "LINE_OF_BUSINESS": DEFAULT_LOB_LIST[:3], "Status": ["Belum Setup"],
+    }
+    m("setup:filter", lambda: index.take(setup, index.rows(setup_filters)), len(setup))
+    m("setup:export_xlsx", lambda: export_bytes("xlsx", {
+        "Filtered Data": setup, "Summary Area": area_summary(setup), "Summary Status": status_summary(setup),
+    }), len(setup))
+
+    m("ci_hashing", lambda: CICodeBook().encode(progress["COMPLIANCE_INDICATOR"]), len(progress))
+    engine = m("wp:engine_build", lambda: WPProgressEngine(branch, wp, progress, CICodeBook()),
+               len(branch) * len(wp))
+    m("wp:materialize", lambda: sum(len(chunk) for chunk in engine.iter_rows()), engine.n_rows)
+    m("wp:aggregate", lambda: (
+        engine.status_counts(), engine.score_by_lob(), engine.area_progress(), engine.branch_progress()
+    ), engine.n_rows)
+    m("wp:export_csv", lambda: csv_file_from_chunks(engine.iter_rows(), DESIRED_COLS), engine.n_rows)
+
+    m("sampling:network", lambda: stratified_sample(tx, "ID CABANG"), len(tx))
+    merged = tx.merge(data["central"], on="ID CABANG", how="left")
+    m("sampling:central", lambda: central_sample(merged, "COVER CENTRAL CREDIT", 30), len(merged))
+    return results
+
+
+def run_startup(repeat=1):
+    """Cold start tiap halaman app (tanpa upload) di proses Python baru."""
+    results = []
+    for name in APP_PAGES:
+        script = _STARTUP_PROBE.format(
+            app=str(APP_DIR / "app.py"), page=str(APP_DIR / "app_pages" / f"{name}.py"), heavy=HEAVY_MODULES
+        )
+        runs = []
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, cwd=APP_DIR,
+                                 env={**os.environ, "CPRO_PROFILE": "0", "CPRO_TEMPLATE_REFRESH": "0"})
+            lines = out.stdout.strip().splitlines()
+            if out.returncode or not lines:
+                raise RuntimeError(f"startup {name} gagal: {out.stderr[-500:]}")
+            runs.append(json.loads(lines[-1]))
+        best = min(runs, key=lambda r: r["seconds"])
+        results.append({
+            "scale": "startup",
+            "stage": f"startup:{name}",
+            "seconds": round(best["seconds"], 4),
+            "peak_mb": None,
+            "rows_in": None,
+            "rows_out": None,
+            "heavy_imports": best["heavy"],
+            "errors": best["errors"],
+        })
+    return results
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=Path(__file__).resolve().parent, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run(scales, seed=0, repeat=1, excel=True, startup=False):
+    """`scales` = {nama: (jumlah branch, (min, max) transaksi per branch)}."""
+    results = run_startup(repeat) if startup else []
+    templates = load_templates() if scales else None
+    for name, (n_branches, per_branch) in scales.items():
+        results += run_scale(name, n_branches, per_branch, seed, repeat, excel, templates)
+    return {
+        "commit": _git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "seed": seed,
+        "repeat": repeat,
+        "scales": {name: {"branches": b, "tx_per_branch": list(tx)} for name, (b, tx) in scales.items()},
+        "results": results,
+    }
+
+
+def compare(current, baseline):
+    """Rasio waktu & memori terhadap hasil lama (>1 berarti lebih lambat/boros)."""
+    old = {(r["scale"], r["stage"]): r for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        b = old.get((r["scale"], r["stage"]))
+        if b is None:
+            continue
+        rows.append({
+            "scale": r["scale"],
+            "stage": r["stage"],
+            "seconds": r["seconds"],
+            "time_ratio": round(r["seconds"] / b["seconds"], 2) if b["seconds"] else None,
+            "peak_mb": r["peak_mb"],
+            "mem_ratio": round(r["peak_mb"] / b["peak_mb"], 2) if r["peak_mb"] and b["peak_mb"] else None,
+        })
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m cpro.bench", description="Benchmark pipeline C-Pro.")
+    parser.add_argument("--scale", nargs="+", choices=list(SCALES), default=None,
+                        help="preset ukuran (s=100, m=1.000, l=5.000 branch)")
+    parser.add_argument("--branches", type=int, nargs="+", default=None, help="ukuran custom (jumlah branch)")
+    parser.add_argument("--tx", type=int, nargs="+", default=[1_000],
+                        help="transaksi per branch untuk --branches: N atau MIN MAX")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="ulangi tiap tahap, ambil waktu terbaik")
+    parser.add_argument("--no-excel", action="store_true", help="lewati tahap baca Excel")
+    parser.add_argument("--startup", action="store_true", help="ukur juga cold start tiap halaman app")
+    parser.add_argument("--no-pipeline", action="store_true", help="lewati benchmark pipeline data")
+    parser.add_argument("-o", "--out", default="bench.json")
+    parser.add_argument("--compare", default=None, help="JSON hasil lama sebagai pembanding")
+    args = parser.parse_args(argv)
+
+    scales = {name: SCALES[name] for name in args.scale or []}
+    per_branch = (args.tx[0], args.tx[-1])
+    for n in args.branches or []:
+        scales[f"b{n}"] = (n, per_branch)
+    if args.no_pipeline:
+        scales = {}
+    elif not scales:
+        scales = {"s": SCALES["s"]}
+
+    report = run(scales, seed=args.seed, repeat=args.repeat, excel=not args.no_excel, startup=args.startup)
+    Path(args.out).write_text(json.dumps(report, indent=2))
+
+    table = pd.DataFrame(report["results"])
+    if args.compare:
+        table = compare(report, json.loads(Path(args.compare).read_text()))
+    print(table.to_string(index=False))
+    print(f"-> {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
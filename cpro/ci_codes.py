@@ -0,0 +1,92 @@
+# Kode pendek COMPLIANCE_INDICATOR ("CI_" + md5[:6] dari teks yang dinormalisasi).
+#
+# Normalisasi dan hash dilakukan sekali per teks unik, bukan per baris, dan
+# hasilnya disimpan di kamus teks -> kode yang bisa dipersist ke JSON.
+# Karena kode hanya 6 hex, dua teks berbeda bisa dapat kode yang sama;
+# kejadian itu dicatat di `collisions` supaya bisa ditampilkan.
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+CODE_PREFIX = "CI_"
+CODE_HEX_LEN = 6
+
+
+def make_hash(text):
+    return CODE_PREFIX + hashlib.md5(text.encode()).hexdigest()[:CODE_HEX_LEN]
+
+
+def normalize_unique(values):
+    # sama dengan " ".join(str(s).split()).strip().lower(), tapi vectorized
+    return pd.Index(values).astype(str).str.split().str.join(" ").str.lower()
+
+
+class CICodeBook:
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self._codes = {}  # teks normal -> kode
+        self._owner = {}  # kode -> teks normal pertama yang memakainya
+        self.collisions = {}  # kode -> set teks normal yang bentrok
+        self._dirty = False
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            try:
+                saved = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                saved = {}
+            for text, code in saved.items():
+                self._register(text, code)
+            self._dirty = False
+
+    def _register(self, text, code):
+        self._codes[text] = code
+        owner = self._owner.setdefault(code, text)
+        if owner != text:
+            self.collisions.setdefault(code, {owner}).add(text)
+        self._dirty = True
+
+    def codes_for_texts(self, texts):
+        with self._lock:
+            out = []
+            for text in texts:
+                code = self._codes.get(text)
+                if code is None:
+                    code = make_hash(text)
+                    self._register(text, code)
+                out.append(code)
+            return out
+
+    def encode(self, series):
+        """COMPLIANCE_INDICATOR -> CI_CODE (None untuk nilai kosong)."""
+        codes, uniques = pd.factorize(series)  # -1 = NaN
+        norm_codes, norm_uniques = pd.factorize(normalize_unique(uniques))
+        code_per_norm = np.array(self.codes_for_texts(norm_uniques), dtype=object)
+        # slot terakhir untuk NaN (kode -1) -> None
+        code_per_unique = np.append(code_per_norm[norm_codes], None)
+        return pd.Series(code_per_unique[codes], index=series.index, name="CI_CODE", dtype=object)
+
+    def collisions_in(self, series_list):
+        """Kode bentrok yang benar-benar muncul di data ini."""
+        if not self.collisions:
+            return {}
+        present = set()
+        for s in series_list:
+            present.update(s.dropna().unique())
+        return {code: sorted(texts) for code, texts in self.collisions.items() if code in present}
+
+    def save(self):
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            tmp = self.path.with_suffix(f".{threading.get_ident()}.tmp")
+            try:
+                tmp.write_text(json.dumps(self._codes, ensure_ascii=False), encoding="utf-8")
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError:
+                tmp.unlink(missing_ok=True)
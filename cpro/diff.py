@@ -0,0 +1,99 @@
+# Diff per baris antara dua snapshot progress (hash join pada kunci).
+#
+# Monitoring Setup dibandingkan per (BRANCH_ID, LINE_OF_BUSINESS); WP Progress
+# per (BRANCH_ID, LOB, SUB_WP, PROCESS, CI_CODE). Setiap kunci diberi label
+# perubahan: baru selesai, mundur, tidak berubah, baris baru, baris hilang.
+import numpy as np
+import pandas as pd
+
+from cpro.monitoring import STATUS_SUDAH
+from cpro.wp_progress import DEFAULT_CODEBOOK, MERGE_KEYS, SUBMIT, add_ci_code
+
+SETUP_KEYS = ["BRANCH_ID", "LINE_OF_BUSINESS"]
+WP_KEYS = MERGE_KEYS
+ATTR_COLS = ["AREA", "BRANCH_NAME"]
+
+NEWLY_DONE = "Baru Selesai"
+REGRESSED = "Mundur"
+UNCHANGED = "Tidak Berubah"
+ADDED = "Baris Baru"
+REMOVED = "Baris Hilang"
+CHANGE_ORDER = [NEWLY_DONE, REGRESSED, ADDED, REMOVED, UNCHANGED]
+
+
+def detect_kind(df):
+    """'setup' untuk export Monitoring Setup User, 'wp' untuk WPProgress, None kalau tidak dikenal."""
+    cols = set(df.columns.str.strip())
+    if {"Status", *SETUP_KEYS} <= cols:
+        return "setup"
+    if {"STATUS", "COMPLIANCE_INDICATOR", *(k for k in WP_KEYS if k != "CI_CODE")} <= cols:
+        return "wp"
+    return None
+
+
+def setup_percentages(df_before_all, df_after_all):
+    """Persentase 'Sudah Setup' sebelum vs sesudah (tabel ringkas Komparasi Progress)."""
+    persen = []
+    for df in (df_before_all, df_after_all):
+        sudah = df["Status"].eq(STATUS_SUDAH).sum()
+        persen.append(sudah / len(df) * 100 if len(df) > 0 else 0)
+    df_compare = pd.DataFrame({
+        "Waktu": ["Sebelum", "Sesudah"],
+        "Persentase": persen
+    })
+    df_compare["Perubahan"] = df_compare["Persentase"].diff()
+    return df_compare
+
+
+def prepare(df, kind, codebook=DEFAULT_CODEBOOK):
+    """Ambil kolom kunci + atribut, dan DONE (Sudah Setup / SUBMIT) per baris."""
+    df = df.rename(columns=lambda c: str(c).strip())
+    if kind == "setup":
+        keys, done = SETUP_KEYS, df["Status"].eq(STATUS_SUDAH)
+    else:
+        df = add_ci_code(df[[c for c in df.columns if c != "CI_CODE"]], codebook)
+        keys, done = WP_KEYS, df["STATUS"].astype(str).str.strip().eq(SUBMIT)
+    out = df[keys + [c for c in ATTR_COLS if c in df.columns]].copy()
+    out["DONE"] = done.to_numpy()
+    return out, keys
+
+
+def _collapse(df, keys):
+    # satu baris per kunci: selesai kalau salah satu barisnya selesai
+    agg = {"DONE": "max", **{c: "first" for c in ATTR_COLS if c in df.columns}}
+    return df.groupby(keys, dropna=False, sort=False).agg(agg).reset_index()
+
+
+def diff_snapshots(before, after, keys):
+    before, after = _collapse(before, keys), _collapse(after, keys)
+    delta = before.merge(after, on=keys, how="outer", suffixes=("_BEFORE", "_AFTER"), indicator=True)
+
+    for col in ATTR_COLS:
+        if f"{col}_AFTER" in delta.columns:
+            delta[col] = delta[f"{col}_AFTER"].combine_first(delta[f"{col}_BEFORE"])
+            delta.drop(columns=[f"{col}_BEFORE", f"{col}_AFTER"], inplace=True)
+
+    side = delta.pop("_merge").to_numpy()
+    was = delta["DONE_BEFORE"].eq(True).to_numpy()  # kosong (baris baru/hilang) = belum selesai
+    now = delta["DONE_AFTER"].eq(True).to_numpy()
+    delta["PERUBAHAN"] = pd.Categorical(np.select(
+        [side == "right_only", side == "left_only", ~was & now, was & ~now],
+        [ADDED, REMOVED, NEWLY_DONE, REGRESSED],
+        default=UNCHANGED,
+    ), categories=CHANGE_ORDER)
+    return delta
+
+
+def change_summary(delta):
+    return delta["PERUBAHAN"].value_counts().reindex(CHANGE_ORDER, fill_value=0).rename_axis("PERUBAHAN").reset_index(name="JUMLAH")
+
+
+def area_delta(delta):
+    """Jumlah tiap jenis perubahan per AREA (tanpa 'Tidak Berubah')."""
+    changed = delta[delta["PERUBAHAN"] != UNCHANGED]
+    if "AREA" not in changed.columns:
+        changed = changed.assign(AREA="(tanpa AREA)")
+    return (
+        changed.groupby(["AREA", "PERUBAHAN"], observed=True, dropna=False).size()
+        .reset_index(name="JUMLAH")
+    )
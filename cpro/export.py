@@ -0,0 +1,107 @@
+# Export hasil monitoring ke file (xlsx, csv.gz, parquet).
+#
+# Sheet besar ditulis baris per baris dengan mode constant_memory xlsxwriter,
+# sehingga memori tidak ikut membengkak seukuran data yang diekspor.
+import io
+
+import pandas as pd
+
+EXPORT_FORMATS = {
+    "xlsx": ("Excel (.xlsx)", ".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv.gz": ("CSV.gz (data saja)", ".csv.gz", "application/gzip"),
+    "parquet": ("Parquet (data saja)", ".parquet", "application/vnd.apache.parquet"),
+}
+WRITE_CHUNK_ROWS = 50_000
+
+
+def _python_rows(df):
+    # NaN/NaT -> None (sel kosong), angka numpy -> angka Python
+    for start in range(0, len(df), WRITE_CHUNK_ROWS):
+        chunk = df.iloc[start:start + WRITE_CHUNK_ROWS].astype(object)
+        chunk = chunk.where(chunk.notna(), None)
+        yield from chunk.itertuples(index=False, name=None)
+
+
+def write_excel(sheets, target):
+    """Tulis {nama sheet: DataFrame} ke `target` (path atau file-like)."""
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(target, {
+        "constant_memory": True,
+        "nan_inf_to_errors": True,
+        "default_date_format": "yyyy-mm-dd hh:mm:ss",
+    })
+    header = workbook.add_format({"bold": True, "border": 1, "align": "center"})
+    for name, df in sheets.items():
+        sheet = workbook.add_worksheet(name)
+        sheet.write_row(0, 0, [str(c) for c in df.columns], header)
+        for r, values in enumerate(_python_rows(df), start=1):
+            sheet.write_row(r, 0, values)
+    workbook.close()
+
+
+def excel_bytes(sheets):
+    output = io.BytesIO()
+    write_excel(sheets, output)
+    return output.getvalue()
+
+
+def csv_gz_bytes(df):
+    output = io.BytesIO()
+    df.to_csv(output, index=False, encoding="utf-8-sig", compression={"method": "gzip", "compresslevel": 5})
+    return output.getvalue()
+
+
+def iter_csv(chunks, columns):
+    """CSV (utf-8-sig) per potongan DataFrame; header hanya di potongan pertama."""
+    first = True
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=first).encode("utf-8-sig" if first else "utf-8")
+        first = False
+    if first:
+        yield pd.DataFrame(columns=columns).to_csv(index=False).encode("utf-8-sig")
+
+
+def csv_file_from_chunks(chunks, columns):
+    # hanya satu buffer CSV yang dipegang utuh (bukan DataFrame gabungan, bukan salinan bytes);
+    # BytesIO-nya langsung diberikan ke st.download_button
+    output = io.BytesIO()
+    for part in iter_csv(chunks, columns):
+        output.write(part)
+    output.seek(0)
+    return output
+
+
+# tipe hasil infer_dtype yang bisa langsung ditulis Arrow tanpa konversi
+_ARROW_UNIFORM = {"empty", "string", "bytes", "integer", "floating", "mixed-integer-float",
+                  "boolean", "decimal", "date", "datetime", "datetime64", "timedelta", "timedelta64"}
+
+
+def _arrow_safe(df):
+    # kolom object campuran (mis. [70100, "KC-01"]) ditolak Arrow -> nilai non-kosong jadi teks
+    mixed = [c for c in df.columns if df[c].dtype == object
+             and pd.api.types.infer_dtype(df[c], skipna=True) not in _ARROW_UNIFORM]
+    if not mixed:
+        return df
+    df = df.copy()
+    for c in mixed:
+        df[c] = df[c].map(str, na_action="ignore").astype(object)
+    return df
+
+
+def parquet_bytes(df):
+    output = io.BytesIO()
+    _arrow_safe(df).to_parquet(output, index=False)
+    return output.getvalue()
+
+
+def export_bytes(fmt, sheets):
+    """Sheet pertama adalah data; csv.gz dan parquet hanya berisi sheet itu."""
+    if fmt == "xlsx":
+        return excel_bytes(sheets)
+    data = next(iter(sheets.values()))
+    if fmt == "csv.gz":
+        return csv_gz_bytes(data)
+    if fmt == "parquet":
+        return parquet_bytes(data)
+    raise ValueError(f"Format export tidak dikenal: {fmt}")
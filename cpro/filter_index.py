@@ -0,0 +1,77 @@
+# Index nilai -> posisi baris untuk filter multi-select.
+#
+# Dibangun sekali per dataset: setiap kolom di-factorize, lalu posisi baris
+# dikelompokkan per nilai (posisi nilai ke-k = order[start[k]:start[k + 1]],
+# urut naik). Filter satu kolom (OR antar nilai) cukup mengambil potongan
+# posisi nilai terpilih; antar kolom (AND) dimulai dari kolom dengan baris
+# paling sedikit lalu dicek lewat tabel kode, jadi tidak ada `.isin` penuh
+# atas teks dan tidak ada salinan DataFrame sampai baris hasil diambil.
+import numpy as np
+import pandas as pd
+
+
+class FilterIndex:
+    def __init__(self, df, columns):
+        self.n_rows = len(df)
+        self._codes, self._values, self._lookup = {}, {}, {}
+        self._order, self._start, self._counts = {}, {}, {}
+        for col in columns:
+            codes, uniques = pd.factorize(df[col])
+            values = np.asarray(uniques, dtype=object)
+            k = len(values)
+            codes = codes.astype(np.int32)
+            codes[codes < 0] = k  # slot terakhir = kosong (NaN)
+            counts = np.bincount(codes, minlength=k + 1)
+            self._codes[col] = codes
+            self._values[col] = values
+            self._lookup[col] = {v: i for i, v in enumerate(values.tolist())}
+            self._order[col] = np.argsort(codes, kind="stable").astype(np.int64)
+            self._start[col] = np.concatenate([[0], np.cumsum(counts)])
+            self._counts[col] = counts
+
+    def _lut(self, column, values, include_missing=False):
+        # tabel kode -> lolos/tidak; nilai yang tidak ada di data diabaikan
+        lookup = self._lookup[column]
+        lut = np.zeros(len(self._values[column]) + 1, dtype=bool)
+        lut[[lookup[v] for v in values if v in lookup]] = True
+        lut[-1] = include_missing
+        return lut
+
+    def _positions(self, column, lut):
+        order, start = self._order[column], self._start[column]
+        parts = [order[start[c]:start[c + 1]] for c in np.flatnonzero(lut)]
+        if not parts:
+            return np.zeros(0, dtype=np.int64)
+        return parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+
+    def rows(self, filters, missing=()):
+        """Posisi baris (urut naik) yang lolos semua filter, atau None kalau tidak ada filter.
+
+        `filters` = {kolom: nilai terpilih}: None berarti kolom itu tidak
+        difilter, daftar kosong berarti tidak ada baris yang lolos. Kolom di
+        `missing` juga meloloskan baris yang kosong.
+        """
+        luts = {
+            col: self._lut(col, values, col in missing)
+            for col, values in filters.items() if values is not None
+        }
+        if not luts:
+            return None
+        sizes = {col: int(self._counts[col][lut].sum()) for col, lut in luts.items()}
+        first = min(sizes, key=sizes.get)
+        rows = self._positions(first, luts[first])
+        for col, lut in luts.items():
+            if col != first and len(rows):
+                rows = rows[lut[self._codes[col][rows]]]
+        return rows
+
+    def options(self, column, filters=None, missing=()):
+        """Nilai `column` (urut, tanpa kosong) yang muncul di baris yang lolos filter kolom lain."""
+        rows = self.rows({col: v for col, v in (filters or {}).items() if col != column}, missing)
+        k = len(self._values[column])
+        counts = self._counts[column] if rows is None else np.bincount(self._codes[column][rows], minlength=k + 1)
+        return sorted(self._values[column][counts[:k] > 0].tolist())
+
+    @staticmethod
+    def take(df, rows):
+        return df if rows is None else df.take(rows)
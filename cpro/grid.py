@@ -0,0 +1,75 @@
+# Tabel berhalaman di sisi server: cari, urutkan, lalu ambil satu halaman.
+#
+# Sumber data berupa potongan DataFrame (satu DataFrame, atau iter_rows engine
+# WP), jadi hasil besar tidak perlu dibentuk utuh: tanpa urutan cukup simpan
+# baris di jendela halaman, dengan urutan cukup simpan `start + size` baris
+# teratas per potongan. Yang dikirim ke browser hanya halaman itu.
+import numpy as np
+import pandas as pd
+
+PAGE_SIZES = [25, 50, 100, 200]
+DEFAULT_PAGE_SIZE = 50
+
+
+def search_mask(df, term, columns=None):
+    """Baris yang salah satu kolomnya mengandung `term` (tanpa beda huruf besar/kecil)."""
+    mask = np.zeros(len(df), dtype=bool)
+    for col in columns or df.columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # cukup cek kamus kategori, lalu petakan lewat kode
+            hit = values.cat.categories.astype(str).str.contains(term, case=False, regex=False)
+            codes = values.cat.codes.to_numpy()
+            mask |= (codes >= 0) & np.append(hit, False)[codes]
+        else:
+            hit = values.astype(str).str.contains(term, case=False, regex=False).to_numpy()
+            mask |= hit & values.notna().to_numpy()
+    return mask
+
+
+def _sorted(df, sort_by, ascending):
+    try:
+        return df.sort_values(sort_by, ascending=ascending, kind="stable", na_position="last")
+    except TypeError:
+        # kolom campuran angka & teks: urutkan sebagai teks
+        return df.sort_values(
+            sort_by, ascending=ascending, kind="stable", na_position="last",
+            key=lambda s: s.where(s.isna(), s.astype(str)),
+        )
+
+
+def query_page(chunks, search=None, sort_by=None, ascending=True, start=0, size=DEFAULT_PAGE_SIZE,
+               total=None, search_columns=None):
+    """Satu halaman dari `chunks` (DataFrame atau iterable potongan DataFrame).
+
+    Mengembalikan (halaman, jumlah baris yang cocok). Kalau `total` sudah
+    diketahui dan tidak ada pencarian/urutan, iterasi berhenti begitu
+    halaman terisi.
+    """
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    need = start + size
+    matched, kept, columns = 0, [], None
+    for chunk in chunks:
+        columns = chunk.columns if columns is None else columns
+        if search:
+            chunk = chunk[search_mask(chunk, search, search_columns)]
+        offset, matched = matched, matched + len(chunk)
+        if len(chunk) == 0:
+            continue
+        if sort_by is None:
+            lo, hi = max(start - offset, 0), min(need - offset, len(chunk))
+            if lo < hi:
+                kept.append(chunk.iloc[lo:hi])
+            if total is not None and not search and matched >= need:
+                return pd.concat(kept), total
+        else:
+            # baris teratas sejauh ini; urutan stabil menjaga urutan asli untuk nilai sama
+            kept = [_sorted(pd.concat(kept + [chunk]) if kept else chunk, sort_by, ascending).head(need)]
+
+    if not kept:
+        return pd.DataFrame(columns=columns), matched
+    page = pd.concat(kept)
+    if sort_by is not None:
+        page = page.iloc[start:need]
+    return page, matched
@@ -0,0 +1,421 @@
+# Cache upload berbasis hash isi file.
+#
+# Setiap rerun Streamlit memanggil ulang pd.read_excel untuk semua upload.
+# Di sini workbook cukup di-parse sekali: hasilnya disimpan sebagai tabel
+# Arrow di memori dan sebagai Parquet di folder cache, dengan kunci hash isi
+# file (bukan nama file), lalu dibuang secara LRU kalau melewati budget.
+#
+# Halaman yang tahu kolom apa saja yang dipakai memberi `columns`
+# ({kolom: TEXT | NUMBER}, lihat schema.py); workbook lalu dibaca langsung
+# dengan openpyxl read-only dan hanya kolom itu yang dikonversi. Beberapa
+# upload sekaligus (`read_many`) di-parse paralel di process pool.
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from cpro.schema import NUMBER, TEXT
+from cpro.settings import DEFAULT_CACHE_DIR, cache_dir
+
+DEFAULT_MEMORY_MB = 512
+DEFAULT_DISK_MB = 2048
+# di bawah ukuran ini (total file yang belum di-cache) parse di proses sendiri saja;
+# start worker pool lebih mahal daripada parse file kecil
+PARALLEL_MIN_BYTES = 2 * 1024 * 1024
+
+
+def read_source_bytes(source):
+    """Ambil isi file dari bytes, path, UploadedFile Streamlit, atau file-like."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        return Path(source).read_bytes()
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    pos = source.tell()
+    data = source.read()
+    source.seek(pos)
+    return data
+
+
+def content_digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def source_digest(source):
+    return content_digest(read_source_bytes(source))
+
+
+def _options_key(options):
+    # opsi read_excel ikut jadi bagian kunci (sheet_name, usecols, dtype, ...)
+    if not options:
+        return ""
+    text = json.dumps(options, sort_keys=True, default=repr)
+    return "-" + hashlib.blake2b(text.encode(), digest_size=6).hexdigest()
+
+
+_EXCEL_ERRORS = {"#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!", "#N/A"}
+
+
+def _cell_value(value):
+    # sama dengan konversi sel pandas (openpyxl): float bulat -> int, kosong -> NaN
+    if value is None:
+        return np.nan
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.startswith("#") and value in _EXCEL_ERRORS:
+        return np.nan
+    return value
+
+
+def read_xlsx_columns(data, columns, sheet=0):
+    """Baca hanya `columns` ({nama: TEXT | NUMBER}) dari sheet pertama workbook.
+
+    Nama header di-strip sebelum dicocokkan; kolom yang tidak ada di file
+    dilewati. Seperti pd.read_excel, baris kosong di akhir sheet dibuang.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(io.BytesIO(data), read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = workbook.worksheets[sheet]
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(c).strip() if c is not None else "" for c in next(rows, ())]
+        wanted = [(name, header.index(name)) for name in columns if name in header]
+
+        values = [[] for _ in wanted]
+        n_rows = seen = 0
+        for row in rows:
+            seen += 1
+            width = len(row)
+            for out, (_, i) in zip(values, wanted):
+                out.append(_cell_value(row[i]) if i < width else np.nan)
+            if any(v is not None for v in row):
+                n_rows = seen
+    finally:
+        workbook.close()
+    values = [out[:n_rows] for out in values]
+
+    df = pd.DataFrame({
+        name: pd.Series(out, dtype=object) for (name, _), out in zip(wanted, values)
+    })
+    for name, _ in wanted:
+        if columns[name] == NUMBER:
+            df[name] = pd.to_numeric(df[name], errors="coerce")
+    return df
+
+
+def _csv_text(value):
+    # teks CSV untuk kolom TEXT: bilangan bulat kanonik jadi int seperti sel angka di xlsx,
+    # sisanya tetap teks (mis. "00123" dan "KC-01")
+    try:
+        number = int(value)
+    except ValueError:
+        return value
+    return number if str(number) == value else value
+
+
+def read_csv_columns(source, columns):
+    """Padanan read_xlsx_columns untuk CSV: hanya `columns`, header di-strip, tipe sesuai schema."""
+    df = pd.read_csv(source, dtype=str, usecols=lambda c: str(c).strip() in columns)
+    df.columns = df.columns.map(lambda c: str(c).strip())
+    for name in df.columns:
+        if columns[name] == NUMBER:
+            df[name] = pd.to_numeric(df[name], errors="coerce")
+        else:
+            df[name] = df[name].map(_csv_text, na_action="ignore").astype(object)
+    return df[[name for name in columns if name in df.columns]]
+
+
+DEFAULT_STREAM_ROWS = 50_000
+
+
+def _header_names(cells):
+    # nama kolom seperti pd.read_excel: kosong -> "Unnamed: i", nama dobel -> "X.1", "X.2", ...
+    cells = list(cells)
+    while cells and cells[-1] is None:
+        cells.pop()
+    names, seen = [], {}
+    for i, cell in enumerate(cells):
+        name = f"Unnamed: {i}" if cell is None else cell
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _iter_xlsx_chunks(source, chunk_rows, sheet=0):
+    from openpyxl import load_workbook
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    workbook = load_workbook(source, read_only=True, data_only=True, keep_links=False)
+    try:
+        rows = workbook.worksheets[sheet].iter_rows(values_only=True)
+        header = _header_names(next(rows, ()))
+        width = len(header)
+        buffer, blank, emitted = [], 0, False
+        for row in rows:
+            if all(v is None for v in row):
+                blank += 1  # baru ikut kalau masih ada baris berisi sesudahnya
+                continue
+            buffer.extend([np.nan] * width for _ in range(blank))
+            blank = 0
+            values = [_cell_value(v) for v in row[:width]]
+            buffer.append(values + [np.nan] * (width - len(values)))
+            if len(buffer) >= chunk_rows:
+                yield pd.DataFrame(buffer, columns=header)
+                buffer, emitted = [], True
+        if buffer or not emitted:
+            yield pd.DataFrame(buffer, columns=header)
+    finally:
+        workbook.close()
+
+
+def iter_table_chunks(source, chunk_rows=DEFAULT_STREAM_ROWS, name=None):
+    """Baca sheet pertama workbook (atau CSV) per potongan `chunk_rows` baris.
+
+    Yang ada di memori hanya satu potongan, jadi file yang terlalu besar untuk
+    pd.read_excel tetap bisa diproses. Format ditentukan dari `name` (default
+    nama file `source`). Nilai sel dikonversi seperti pd.read_excel, tetapi
+    tipe kolom disimpulkan per potongan.
+    """
+    name = str(name or getattr(source, "name", source))
+    if name.lower().endswith(".csv"):
+        with pd.read_csv(source, chunksize=chunk_rows) as reader:
+            yield from reader
+        return
+    yield from _iter_xlsx_chunks(source, chunk_rows)
+
+
+def peek_table(source, rows=100, name=None):
+    """Header + `rows` baris pertama saja (file tidak dibaca sampai habis)."""
+    chunks = iter_table_chunks(source, chunk_rows=rows, name=name)
+    try:
+        return next(chunks)
+    finally:
+        chunks.close()
+
+
+def _parse(data, columns, options):
+    # top-level supaya bisa dijalankan di worker process
+    if columns:
+        return read_xlsx_columns(data, columns, **options)
+    return pd.read_excel(io.BytesIO(data), **options)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    # satu pool per proses; spawn supaya aman dipakai dari server Streamlit yang multi-thread
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = int(os.environ.get("CPRO_READ_WORKERS", 0)) or min(4, os.cpu_count() or 1)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _parse_parallel(jobs):
+    """[(data, columns)] -> [DataFrame]; kembali ke parse berurutan kalau pool rusak."""
+    global _pool
+    try:
+        pool = _get_pool()
+        futures = [pool.submit(_parse, data, cols, {}) for data, cols in jobs]
+        return [future.result() for future in futures]
+    except (BrokenProcessPool, OSError, RuntimeError):
+        with _pool_lock:
+            _pool = None
+        return [_parse(data, cols, {}) for data, cols in jobs]
+
+
+class UploadCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, memory_budget_mb=DEFAULT_MEMORY_MB,
+                 disk_budget_mb=DEFAULT_DISK_MB):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.disk_budget = int(disk_budget_mb * 1024 * 1024)
+        self._memory = OrderedDict()  # key -> (pa.Table | DataFrame, nbytes)
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            cache_dir=cache_dir(),
+            memory_budget_mb=float(os.environ.get("CPRO_CACHE_MEMORY_MB", DEFAULT_MEMORY_MB)),
+            disk_budget_mb=float(os.environ.get("CPRO_CACHE_DISK_MB", DEFAULT_DISK_MB)),
+        )
+
+    def read_excel(self, source, columns=None, **options):
+        data = read_source_bytes(source)
+        key = content_digest(data) + _options_key({**options, "columns": columns} if columns else options)
+
+        cached = self._get(key, columns)
+        if cached is not None:
+            return cached
+
+        df = _parse(data, columns, options)
+        self._put(key, df)
+        return df
+
+    def read_many(self, sources, columns=None, parallel=True):
+        """Baca beberapa workbook; yang belum ada di cache di-parse paralel.
+
+        `columns` berlaku untuk semua file, atau list per file (None = semua kolom).
+        Waktu total mengikuti file terbesar, bukan jumlah semua file.
+        """
+        if not isinstance(columns, list):
+            columns = [columns] * len(sources)
+        results, misses = [], []
+        for i, (source, cols) in enumerate(zip(sources, columns)):
+            data = read_source_bytes(source)
+            key = content_digest(data) + _options_key({"columns": cols} if cols else {})
+            cached = self._get(key, cols)
+            results.append(cached)
+            if cached is None:
+                misses.append((i, key, data, cols))
+
+        jobs = [(data, cols) for _, _, data, cols in misses]
+        if parallel and len(jobs) > 1 and sum(len(data) for data, _ in jobs) >= PARALLEL_MIN_BYTES:
+            parsed = _parse_parallel(jobs)
+        else:
+            parsed = [_parse(data, cols, {}) for data, cols in jobs]
+
+        for (i, key, _, _), df in zip(misses, parsed):
+            self._put(key, df)
+            results[i] = df
+        return results
+
+    # ---------- memori ----------
+    def _get(self, key, columns=None):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return _restore_text(_to_frame(entry[0]), columns)
+
+        path = self._disk_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            table = pq.read_table(path)
+            os.utime(path)  # tandai baru dipakai untuk LRU disk
+        except (OSError, pa.ArrowException):
+            return None
+        self._remember(key, table, table.nbytes)
+        return _restore_text(table.to_pandas(), columns)
+
+    def _put(self, key, df):
+        try:
+            table = pa.Table.from_pandas(df)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # kolom campuran (mis. angka & teks) tidak bisa jadi Arrow;
+            # simpan salinan DataFrame di memori saja
+            self._remember(key, df.copy(), int(df.memory_usage(deep=True).sum()))
+            return
+        self._remember(key, table, table.nbytes)
+        self._write_disk(key, table)
+
+    def _remember(self, key, value, nbytes):
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= old[1]
+            self._memory[key] = (value, nbytes)
+            self._memory_bytes += nbytes
+            # entri terbaru selalu disimpan walau sendirian melebihi budget
+            while self._memory_bytes > self.memory_budget and len(self._memory) > 1:
+                _, (_, size) = self._memory.popitem(last=False)
+                self._memory_bytes -= size
+
+    # ---------- disk ----------
+    def _disk_path(self, key):
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{key}.parquet"
+
+    def _write_disk(self, key, table):
+        path = self._disk_path(key)
+        if path is None:
+            return
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            pq.write_table(table, tmp)
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        self._evict_disk()
+
+    def _evict_disk(self):
+        files = []
+        for p in self.cache_dir.glob("*.parquet"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in files)
+        for _, size, p in sorted(files):
+            if total <= self.disk_budget:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self.cache_dir is not None:
+            for p in self.cache_dir.glob("*.parquet"):
+                p.unlink(missing_ok=True)
+
+
+def _text_value(value):
+    # kebalikan tebakan tipe Arrow: float bulat -> int, kosong -> NaN (seperti _cell_value)
+    if value is None or value is pd.NaT or (isinstance(value, float) and np.isnan(value)):
+        return np.nan
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _restore_text(df, columns):
+    """Kolom TEXT hasil cache dikembalikan ke object apa adanya, sama dengan hasil parse pertama.
+
+    Arrow menebak ulang tipe kolom object (mis. BRANCH_ID angka + kosong jadi
+    float64, kosong di kolom teks jadi None), padahal read_xlsx_columns tidak
+    pernah menghasilkan float bulat dan kosong selalu NaN.
+    """
+    if not columns:
+        return df
+    for name, kind in columns.items():
+        if kind == TEXT and name in df.columns:
+            values = [_text_value(v) for v in df[name].astype(object)]
+            df[name] = pd.Series(values, index=df.index, dtype=object)
+    return df
+
+
+def _to_frame(value):
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    return value.to_pandas()
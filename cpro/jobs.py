@@ -0,0 +1,125 @@
+# Antrian job background untuk pipeline berat (Sampling Central, engine WP).
+#
+# Job dijalankan di thread pool, jadi script Streamlit tidak terblokir dan
+# rerun karena widget tidak mengulang perhitungan: job dicari lewat kunci
+# input-nya, yang sedang berjalan atau sudah selesai langsung dipakai lagi.
+# Pipeline menerima callback `progress(done, total, message)` yang sekaligus
+# titik batal: setelah `cancel()`, panggilan berikutnya melempar JobCancelled.
+import itertools
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+_ids = itertools.count(1)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, key, label):
+        self.id = next(_ids)
+        self.key = key
+        self.label = label
+        self.status = QUEUED
+        self.fraction = 0.0
+        self.message = "Menunggu giliran..."
+        self.result = None
+        self.error = None
+        self.traceback = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.ended_at = None
+        self._cancel = threading.Event()
+
+    @property
+    def done(self):
+        return self.status in FINISHED
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.ended_at or time.time()) - self.started_at
+
+    def report(self, done, total=None, message=None):
+        """Callback progress untuk pipeline; melempar JobCancelled kalau job sudah dibatalkan."""
+        if self._cancel.is_set():
+            raise JobCancelled(self.label)
+        if total:  # total None: jumlah belum diketahui, cukup perbarui pesan
+            self.fraction = min(max(done / total, 0.0), 1.0)
+        if message is not None:
+            self.message = message
+
+    def cancel(self):
+        """Minta batal; job berhenti di panggilan progress berikutnya (atau sebelum mulai)."""
+        self._cancel.set()
+        if self.status == QUEUED:
+            self.message = "Dibatalkan sebelum mulai"
+
+    def _run(self, func, args, kwargs):
+        if self._cancel.is_set():
+            self.status, self.ended_at = CANCELLED, time.time()
+            return
+        self.status, self.started_at, self.message = RUNNING, time.time(), "Berjalan..."
+        try:
+            result = func(*args, progress=self.report, **kwargs)
+            self.report(1, 1, "Selesai")  # batal tepat di akhir: hasilnya dibuang
+            self.result, self.status = result, DONE
+        except JobCancelled:
+            self.status, self.message = CANCELLED, "Dibatalkan"
+        except Exception as exc:  # gagal dilaporkan ke UI, bukan mematikan worker
+            self.status, self.message = FAILED, "Gagal"
+            self.error = f"{type(exc).__name__}: {exc}"
+            self.traceback = traceback.format_exc()
+        finally:
+            self.ended_at = time.time()
+
+
+class JobManager:
+    """Job per kunci input di thread pool; `keep` job selesai terakhir disimpan hasilnya."""
+
+    def __init__(self, max_workers=2, keep=8):
+        self.keep = keep
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cpro-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, key, func, *args, label=None, **kwargs):
+        """Job untuk `key`: yang berjalan/selesai dipakai ulang, yang gagal/batal diulang dari awal.
+
+        `func(*args, progress=..., **kwargs)` dijalankan di worker thread.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.status not in (FAILED, CANCELLED) and not job._cancel.is_set():
+                self._jobs.move_to_end(key)
+                return job
+            job = Job(key, label or str(key))
+            self._jobs[key] = job
+            self._evict()
+        self._pool.submit(job._run, func, args, kwargs)
+        return job
+
+    def get(self, key):
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None:
+                self._jobs.move_to_end(key)
+            return job
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _evict(self):
+        # hanya job yang sudah selesai yang dibuang, mulai dari yang paling lama tidak dipakai
+        finished = [key for key, job in self._jobs.items() if job.done]
+        for key in finished[:max(0, len(finished) - self.keep)]:
+            del self._jobs[key]
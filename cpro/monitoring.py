@@ -0,0 +1,84 @@
+# Monitoring Setup User: ekspansi Branch × LOB dan status setup.
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cpro.schema import TEXT
+
+DEFAULT_LOB_LIST = [
+    "COLLATERAL", "CR 1", "CR 2", "FINANCE, ACCOUNTING & TAX",
+    "CREDIT", "CRM", "GS, EHS & IT", "HC", "IWM", "MFI",
+    "MMU", "MPF", "NMC", "UFI"
+]
+
+# kolom yang dibaca dari upload Branch dan Realisasi Setup
+BRANCH_COLUMNS = {"BRANCH_ID": TEXT, "BRANCH_NAME": TEXT, "AREA": TEXT}
+REALISASI_COLUMNS = {"BRANCH_ID": TEXT, "LINE_OF_BUSINESS": TEXT, "EMPLOYEE_NUMBER": TEXT}
+
+# kolom filter multi-select halaman Setup Monitoring
+FILTER_COLUMNS = ["BRANCH_NAME", "AREA", "LINE_OF_BUSINESS", "Status"]
+
+STATUS_SUDAH = "Sudah Setup"
+STATUS_BELUM = "Belum Setup"
+
+
+def parse_lob_list(text):
+    # satu LOB per baris (nama LOB sendiri bisa mengandung koma)
+    lobs = []
+    for line in text.splitlines():
+        lob = line.strip()
+        if lob and lob not in lobs:
+            lobs.append(lob)
+    return lobs
+
+
+def load_lob_list(path=None):
+    """Daftar LOB dari file teks (CPRO_LOB_FILE), atau default bawaan."""
+    path = path or os.environ.get("CPRO_LOB_FILE")
+    if path and Path(path).exists():
+        lobs = parse_lob_list(Path(path).read_text(encoding="utf-8"))
+        if lobs:
+            return lobs
+    return list(DEFAULT_LOB_LIST)
+
+
+def expand_branch_lob(df_branch, lob_list):
+    """Setiap branch diulang untuk setiap LOB, urutan sama dengan loop iterrows lama."""
+    lob_list = list(dict.fromkeys(lob_list))
+    base = df_branch[["BRANCH_ID", "BRANCH_NAME", "AREA"]]
+    n_branch, n_lob = len(base), len(lob_list)
+
+    expected = base.iloc[np.repeat(np.arange(n_branch), n_lob)].reset_index(drop=True)
+    expected["LINE_OF_BUSINESS"] = pd.Categorical.from_codes(
+        np.tile(np.arange(n_lob), n_branch), categories=lob_list
+    )
+    return expected
+
+
+def build_setup_monitoring(df_branch, df_real, lob_list):
+    df_expected = expand_branch_lob(df_branch, lob_list)
+
+    # Join dengan data realisasi
+    df_merge = pd.merge(
+        df_expected,
+        df_real[["BRANCH_ID", "LINE_OF_BUSINESS", "EMPLOYEE_NUMBER"]],
+        on=["BRANCH_ID", "LINE_OF_BUSINESS"],
+        how="left"
+    )
+
+    # Tentukan status
+    df_merge["Status"] = np.where(df_merge["EMPLOYEE_NUMBER"].notna(), STATUS_SUDAH, STATUS_BELUM)
+    return df_merge
+
+
+def area_summary(df_merge):
+    # Summary untuk plot: jumlah baris per AREA × Status
+    return df_merge.groupby(["AREA", "Status"]).size().reset_index(name="Count")
+
+
+def status_summary(df_merge):
+    summary = df_merge["Status"].value_counts().reset_index()
+    summary.columns = ["Status", "Count"]
+    return summary
@@ -0,0 +1,140 @@
+# Profiling per tahap halaman: waktu, baris masuk/keluar, dan memori.
+#
+# Setiap rerun Streamlit membuat satu StageProfiler. Tahap dibungkus dengan
+# `stage()` (blok) atau `call()` (satu pemanggilan fungsi); di akhir rerun
+# `emit()` menulis satu baris JSON ke logger "cpro.profile" sehingga sesi yang
+# lambat bisa ditelusuri dari log tanpa mengubah kode.
+#
+# Env: CPRO_PROFILE=0 mematikan log, CPRO_PROFILE_LOG=<path> menulis log ke
+# file (default stderr).
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+LOGGER_NAME = "cpro.profile"
+STAGE_COLUMNS = ["stage", "seconds", "rows_in", "rows_out", "rss_mb", "rss_delta_mb", "traced_peak_mb"]
+
+logger = logging.getLogger(LOGGER_NAME)
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * _PAGE_SIZE / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10  # macOS: byte, Linux: KB
+
+
+def _rows(value):
+    # DataFrame/Series/array; pandas tidak di-import di sini supaya halaman ringan tetap ringan
+    return len(value) if type(value).__module__.startswith(("pandas.", "numpy")) and hasattr(value, "__len__") else None
+
+
+def configure_logging():
+    """Pasang handler "cpro.profile" sekali per proses (stderr atau CPRO_PROFILE_LOG)."""
+    if logger.handlers:
+        return logger
+    path = os.environ.get("CPRO_PROFILE_LOG")
+    handler = logging.FileHandler(path, encoding="utf-8") if path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+class StageProfiler:
+    """Catatan tahap untuk satu rerun halaman.
+
+    `trace_memory=True` menyalakan tracemalloc selama rerun (lebih lambat, dan
+    mencakup semua thread di proses); tanpa itu hanya RSS yang dicatat.
+    Tahap tidak boleh bersarang kalau memori ditelusuri.
+    """
+
+    def __init__(self, page=None, session_id=None, trace_memory=False):
+        self.page = page
+        self.session_id = session_id
+        self.trace_memory = trace_memory
+        self.stages = []
+        self.new_modules = []  # diisi pemanggil: modul yang pertama kali di-import rerun ini
+        self._started = time.perf_counter()
+        self._owns_trace = trace_memory and not tracemalloc.is_tracing()
+        if self._owns_trace:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        """Blok yang diukur; isi `record["rows_out"]` di dalam blok kalau perlu."""
+        record = {"stage": name, "rows_in": rows_in, "rows_out": None}
+        rss_before = current_rss_mb()
+        traced_before = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = round(time.perf_counter() - started, 4)
+            rss_after = current_rss_mb()
+            if rss_after is not None:
+                record["rss_mb"] = round(rss_after, 1)
+                if rss_before is not None:
+                    record["rss_delta_mb"] = round(rss_after - rss_before, 1)
+            if traced_before is not None and tracemalloc.is_tracing():
+                peak = tracemalloc.get_traced_memory()[1]
+                record["traced_peak_mb"] = round((peak - traced_before) / 2 ** 20, 2)
+            self.stages.append(record)
+
+    def call(self, name, func, *args, **kwargs):
+        """`func(*args, **kwargs)` sebagai satu tahap; baris dihitung dari argumen pertama dan hasilnya."""
+        with self.stage(name, _rows(args[0]) if args else None) as record:
+            result = func(*args, **kwargs)
+            record["rows_out"] = _rows(result[0] if isinstance(result, tuple) and result else result)
+        return result
+
+    def frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.stages, columns=STAGE_COLUMNS)
+
+    def summary(self):
+        peak = peak_rss_mb()
+        return {
+            "event": "rerun",
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "session": self.session_id,
+            "page": self.page,
+            "total_seconds": round(time.perf_counter() - self._started, 4),
+            "peak_rss_mb": round(peak, 1) if peak is not None else None,
+            "new_modules": self.new_modules,
+            "stages": self.stages,
+        }
+
+    def emit(self):
+        """Tulis ringkasan rerun sebagai satu baris JSON, lalu matikan tracemalloc milik rerun ini."""
+        if self._owns_trace and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            self._owns_trace = False
+        record = self.summary()
+        if os.environ.get("CPRO_PROFILE", "1") != "0":
+            configure_logging().info(json.dumps(record, default=str, ensure_ascii=False))
+        return record
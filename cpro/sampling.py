@@ -0,0 +1,264 @@
+# Engine random sampling (mode Network & Central).
+import numpy as np
+import pandas as pd
+
+DEFAULT_CAP = 30
+DEFAULT_SEED = 42
+
+
+def _random_keys(n, seed):
+    return np.random.default_rng(seed).random(n)
+
+
+def _rank_within(group_codes, keys):
+    """Urutan baris per grup berdasarkan key acak, dan peringkatnya di dalam grup."""
+    order = np.lexsort((keys, group_codes))
+    sorted_codes = group_codes[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_codes)) + 1]
+    sizes = np.diff(np.r_[starts, len(order)])
+    rank = np.arange(len(order)) - np.repeat(starts, sizes)
+    return order, sorted_codes, rank
+
+
+def lowest_keys_per_group(group_codes, keys, quota):
+    """Posisi baris dengan `quota[g]` key terkecil di tiap grup g (kode -1 diabaikan).
+
+    Supaya tidak mengurutkan jutaan baris, hanya baris dengan key di bawah
+    ambang per grup yang diurutkan; grup yang kandidatnya kurang diambil utuh.
+    """
+    quota = np.asarray(quota)
+    valid = group_codes >= 0
+    codes = np.where(valid, group_codes, 0)
+    sizes = np.bincount(group_codes[valid], minlength=len(quota))
+    need = np.minimum(sizes, quota)
+
+    threshold = np.minimum(1.0, (need * 1.5 + 10) / np.maximum(sizes, 1))
+    cand = np.flatnonzero(valid & (keys < threshold[codes]))
+    short = np.bincount(group_codes[cand], minlength=len(quota)) < need
+    if short.any():
+        cand = np.union1d(cand, np.flatnonzero(valid & short[codes]))
+
+    order, sorted_codes, rank = _rank_within(group_codes[cand], keys[cand])
+    keep = rank < quota[sorted_codes]
+    return cand[order[keep]]
+
+
+def stratified_sample(df, by, cap=DEFAULT_CAP, seed=DEFAULT_SEED):
+    """Ambil maksimal `cap` baris acak per strata `by`, dalam satu pass.
+
+    Setiap baris diberi key acak dari `seed`, lalu per strata diambil `cap`
+    key terkecil. Strata kosong (NaN) diabaikan seperti groupby.
+    """
+    group = df.groupby(by, sort=True)
+    group_codes = group.ngroup().fillna(-1).to_numpy(np.int64)
+    keys = _random_keys(len(df), seed)
+    quota = np.full(group.ngroups, cap, dtype=np.int64)
+    return df.iloc[lowest_keys_per_group(group_codes, keys, quota)].reset_index(drop=True)
+
+
+# ---------- MODE NETWORK: STREAMING ----------
+def type_like(series, value):
+    # batas periode dari CLI / input teks selalu string; samakan dengan tipe kolomnya
+    if not isinstance(value, str):
+        return value
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return pd.Timestamp(value)
+    if pd.api.types.is_numeric_dtype(series):
+        return pd.to_numeric(value)
+    return value
+
+
+def period_mask(series, period_min=None, period_max=None):
+    """Baris dengan periode di antara `period_min` dan `period_max` (None = tanpa batas)."""
+    keep = pd.Series(True, index=series.index)
+    if period_min is not None:
+        keep &= series >= type_like(series, period_min)
+    if period_max is not None:
+        keep &= series <= type_like(series, period_max)
+    return keep
+
+
+class StratifiedReservoir:
+    """stratified_sample untuk data yang datang per potongan.
+
+    Key acak diambil berurutan dari satu generator `seed`, jadi baris ke-i
+    mendapat key yang sama dengan di stratified_sample; per strata cukup
+    disimpan `cap` key terkecil sejauh ini. Memori sebanding jumlah sample,
+    dan `result()` sama persis dengan stratified_sample atas data utuh.
+    """
+
+    def __init__(self, by, cap=DEFAULT_CAP, seed=DEFAULT_SEED):
+        self.by, self.cap = by, cap
+        self.rows_seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._kept, self._keys, self._columns = None, np.zeros(0), None
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, chunk):
+        keys = self._rng.random(len(chunk))  # baris strata kosong juga memakai key, seperti di stratified_sample
+        self.rows_seen += len(chunk)
+        if self._columns is None:
+            self._columns = chunk.iloc[:0]
+        valid = chunk[self.by].notna().to_numpy()
+        if len(self):
+            # strata yang sudah penuh: key di atas key terbesarnya tidak mungkin masuk
+            kept = pd.DataFrame({"strata": self._kept[self.by], "key": self._keys}).groupby("strata")["key"]
+            threshold = kept.max()[kept.size() >= self.cap]
+            valid &= keys < chunk[self.by].map(threshold).fillna(np.inf).to_numpy()
+        if not valid.any():
+            return
+        if len(self):
+            combined = pd.concat([self._kept, chunk[valid]], ignore_index=True)
+        else:
+            combined = chunk[valid].reset_index(drop=True)
+        all_keys = np.concatenate([self._keys, keys[valid]])
+        codes, uniques = pd.factorize(combined[self.by])
+        picked = lowest_keys_per_group(codes, all_keys, np.full(len(uniques), self.cap, dtype=np.int64))
+        self._kept, self._keys = combined.iloc[picked].reset_index(drop=True), all_keys[picked]
+
+    def result(self):
+        """Sample akhir, urut strata lalu key (sama dengan stratified_sample)."""
+        if not len(self):
+            return self._columns if self._columns is not None else pd.DataFrame()
+        group_codes = self._kept.groupby(self.by, sort=True).ngroup().to_numpy(np.int64)
+        return self._kept.iloc[np.lexsort((self._keys, group_codes))].reset_index(drop=True)
+
+
+def stream_stratified_sample(chunks, by, cap=DEFAULT_CAP, seed=DEFAULT_SEED, period_col=None,
+                             period_min=None, period_max=None, progress=None):
+    """Sampling Network atas potongan DataFrame (lihat ingest.iter_table_chunks).
+
+    Filter periode diterapkan per potongan sebelum key diambil, jadi hasilnya
+    sama dengan memfilter data utuh lalu memanggil stratified_sample.
+    `progress(done, total, message)` dipanggil per potongan (total tidak diketahui).
+    """
+    reservoir = StratifiedReservoir(by, cap=cap, seed=seed)
+    rows_read = 0
+    for chunk in chunks:
+        rows_read += len(chunk)
+        if period_col:
+            chunk = chunk[period_mask(chunk[period_col], period_min, period_max)]
+        reservoir.add(chunk)
+        if progress:
+            progress(rows_read, None, f"{rows_read:,} baris dibaca, {len(reservoir):,} sample tersimpan")
+    return reservoir.result()
+
+
+# ---------- MODE CENTRAL: ALOKASI KUOTA ----------
+ALLOCATION_METHODS = ["even", "proportional"]
+
+
+def allocate_quota(parent, capacity, totals, method="even", tie_keys=None):
+    """Bagi `totals[p]` sample ke unit-unit milik parent p, dibatasi `capacity`.
+
+    method "even" membagi rata, "proportional" sebanding jumlah data. Sisa
+    pembulatan dibagikan dengan metode largest remainder (seri diputus pakai
+    `tie_keys`), dan kuota unit yang penuh dialihkan ke unit lain.
+    """
+    parent = np.asarray(parent, dtype=np.int64)
+    capacity = np.asarray(capacity, dtype=np.int64)
+    n_parent = len(totals)
+    if tie_keys is None:
+        tie_keys = np.arange(len(parent))
+
+    quota = np.zeros(len(parent), dtype=np.int64)
+    available = np.bincount(parent, capacity, minlength=n_parent).astype(np.int64)
+    remaining = np.minimum(np.asarray(totals, dtype=np.int64), available)
+    while remaining.any():
+        room = capacity - quota
+        weight = np.where(room > 0, capacity if method == "proportional" else 1, 0).astype(float)
+        weight_sum = np.bincount(parent, weight, minlength=n_parent)
+        share = remaining[parent] * weight / np.where(weight_sum > 0, weight_sum, 1)[parent]
+        floor_share = np.floor(share).astype(np.int64)
+        take = np.minimum(floor_share, room)
+        quota += take
+        remaining -= np.bincount(parent, take, minlength=n_parent).astype(np.int64)
+        if (floor_share > room).any():
+            continue  # ada unit yang penuh, sisanya dibagi ulang ke unit lain
+
+        # largest remainder: sisa pembulatan, masing-masing unit dapat +1
+        has_room = quota < capacity
+        frac = np.where(has_room, share - floor_share, -1.0)
+        order = np.lexsort((tie_keys, -frac, parent))
+        sorted_parent = parent[order]
+        starts = np.r_[0, np.flatnonzero(np.diff(sorted_parent)) + 1]
+        rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+        give = order[(rank < remaining[sorted_parent]) & has_room[order]]
+        quota[give] += 1
+        remaining -= np.bincount(parent[give], minlength=n_parent).astype(np.int64)
+    return quota
+
+
+def central_sample(df, central_col, total_sample, branch_col="ID CABANG", extra_group_cols=(),
+                   method="even", seed=DEFAULT_SEED, progress=None):
+    """Sampling per central: `total_sample` dibagi ke cabang, lalu ke sub-grup.
+
+    Mengembalikan (sample, laporan alokasi). Semua sample diambil tanpa
+    duplikat, dan hasilnya sama untuk seed yang sama. `progress(done, total,
+    message)` dipanggil per central.
+    """
+    progress = progress or (lambda *args: None)
+    levels = [central_col, branch_col] + list(extra_group_cols)
+    group = df.groupby(levels, sort=True)
+    row_unit = group.ngroup().fillna(-1).to_numpy(np.int64)
+    report = group.size().rename("Jumlah Data").reset_index()
+    rng = np.random.default_rng(seed)
+
+    # level 1: central -> cabang
+    branch_unit = report.groupby([central_col, branch_col], sort=True).ngroup().to_numpy(np.int64)
+    branches = report.groupby([central_col, branch_col], sort=True)["Jumlah Data"].sum().reset_index()
+    central_code, centrals = pd.factorize(branches[central_col], sort=True)
+    branch_quota = allocate_quota(
+        central_code, branches["Jumlah Data"], np.full(len(centrals), total_sample),
+        method, rng.random(len(branches)),
+    )
+
+    # level 2: cabang -> sub-grup (kalau ada kolom tambahan)
+    if extra_group_cols:
+        quota = allocate_quota(branch_unit, report["Jumlah Data"], branch_quota, method, rng.random(len(report)))
+    else:
+        quota = branch_quota
+    report["Kuota Sample"] = quota
+
+    # key diambil sekali untuk semua baris, lalu dipilih per central (unit satu central
+    # berurutan), jadi hasilnya sama dengan satu pass tetapi bisa dipantau & dibatalkan
+    keys = rng.random(len(df))
+    unit_bounds = np.searchsorted(pd.factorize(report[central_col], sort=True)[0], np.arange(len(centrals) + 1))
+    valid = np.flatnonzero(row_unit >= 0)
+    rows_by_unit = valid[np.argsort(row_unit[valid], kind="stable")]
+    row_bounds = np.searchsorted(row_unit[rows_by_unit], unit_bounds)
+    picked = []
+    for c, central in enumerate(centrals):
+        progress(c, len(centrals), f"Sampling central {c + 1}/{len(centrals)}: {central}")
+        rows = rows_by_unit[row_bounds[c]:row_bounds[c + 1]]
+        first, last = unit_bounds[c], unit_bounds[c + 1]
+        picked.append(rows[lowest_keys_per_group(row_unit[rows] - first, keys[rows], quota[first:last])])
+    picked = np.concatenate(picked) if picked else np.zeros(0, dtype=np.int64)
+    return df.iloc[picked].reset_index(drop=True), report
+
+
+def drop_mapping_columns(sampled_df, prefix="COVER CENTRAL"):
+    # Drop kolom mapping (COVER CENTRAL) dari hasil sample
+    cols_to_drop = [col for col in sampled_df.columns if str(col).startswith(prefix)]
+    return sampled_df.drop(columns=cols_to_drop, errors="ignore")
+
+
+def sample_with_mapping(df, df_map, left_col, right_col, central_col, total_sample, extra_group_cols=(),
+                        method="even", seed=DEFAULT_SEED, progress=None):
+    """Pipeline mode Central: join mapping, sampling, lalu buang kolom mapping.
+
+    `progress(done, total, message)` dipanggil per tahap dan per central (lihat jobs.py).
+    """
+    progress = progress or (lambda *args: None)
+    progress(0, None, "Menggabung mapping central...")
+    merged = df.merge(df_map, left_on=left_col, right_on=right_col, how="left")
+    sampled_df, allocation = central_sample(
+        merged, central_col, total_sample, extra_group_cols=extra_group_cols, method=method, seed=seed,
+        progress=progress
+    )
+    progress(1, None, "Merapikan hasil...")
+    if not sampled_df.empty:
+        sampled_df = drop_mapping_columns(sampled_df)
+    return sampled_df, allocation
@@ -0,0 +1,44 @@
+# Kolom kunci sebagai categorical dengan kamus yang sama antar frame.
+#
+# Branch, WP dan WPProgress mengulang teks yang sama (nama branch, area, LOB,
+# SUB_WP, PROCESS, COMPLIANCE_INDICATOR, ...) di ribuan baris. Dengan satu
+# CategoricalDtype per kolom untuk semua frame, teks disimpan sekali dan
+# merge cukup membandingkan kode integer.
+import numpy as np
+import pandas as pd
+
+# tipe kolom input yang dideklarasikan halaman (lihat ingest.read_xlsx_columns)
+TEXT = "text"  # nilai apa adanya (object), tanpa inferensi tipe; dipakai juga untuk kolom kunci join
+NUMBER = "number"  # pd.to_numeric; sel yang bukan angka jadi NaN (jangan untuk kunci: "KC-01" hilang)
+
+CATEGORY_COLUMNS = [
+    "BRANCH_NAME", "AREA", "LINE_OF_BUSINESS", "SUB_WP", "PROCESS",
+    "STATUS", "COMPLIANCE_INDICATOR", "CI_CODE",
+]
+
+
+def unify_categories(frames, columns=CATEGORY_COLUMNS):
+    """Ubah `columns` di setiap frame jadi categorical dengan kamus bersama (in-place)."""
+    for col in columns:
+        present = [f for f in frames if col in f.columns]
+        if not present:
+            continue
+        values = pd.unique(np.concatenate([np.asarray(f[col].dropna().unique(), dtype=object) for f in present]))
+        try:
+            # kategori terurut supaya groupby/sort tetap urut abjad seperti kolom object
+            values = sorted(values)
+        except TypeError:
+            pass
+        dtype = pd.CategoricalDtype(values)
+        for f in present:
+            if f[col].dtype != dtype:
+                f[col] = f[col].astype(dtype)
+    return frames
+
+
+def key_codes(frame, columns):
+    """Kolom kunci sebagai kode integer (NaN = -1) untuk merge; non-categorical apa adanya."""
+    return pd.DataFrame({
+        col: frame[col].cat.codes if isinstance(frame[col].dtype, pd.CategoricalDtype) else frame[col]
+        for col in columns
+    })
@@ -0,0 +1,11 @@
+# Pengaturan dari environment yang bisa dibaca tanpa import pandas/pyarrow.
+import os
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = ".cpro_cache"
+
+
+def cache_dir():
+    """Folder cache (CPRO_CACHE_DIR); None kalau dikosongkan = cache hanya di memori."""
+    path = os.environ.get("CPRO_CACHE_DIR", DEFAULT_CACHE_DIR)
+    return Path(path) if path else None
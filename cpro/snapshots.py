@@ -0,0 +1,158 @@
+# Snapshot harian hasil Monitoring Setup User untuk tren Komparasi Progress.
+#
+# Setiap file export di-ingest sekali (kunci: hash isi file) ke SQLite sebagai
+# agregat per AREA × LOB × branch, ditandai dengan tanggal snapshot. Tren N
+# hari dihitung dari tabel agregat itu, tanpa membaca ulang file Excel.
+import re
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+
+import pandas as pd
+
+from cpro.monitoring import STATUS_SUDAH
+
+AGG_KEYS = ["AREA", "LINE_OF_BUSINESS", "BRANCH_ID", "BRANCH_NAME"]
+REQUIRED_COLUMNS = ["Status"]
+TREND_DIMENSIONS = {
+    "Keseluruhan": None,
+    "Per AREA": "AREA",
+    "Per LOB": "LINE_OF_BUSINESS",
+    "Per Branch": "BRANCH_NAME",
+}
+# nama file export halaman Monitoring: hasil_monitoring17Oct2026.xlsx
+_NAME_DATE = re.compile(r"(\d{2}[A-Za-z]{3}\d{4})")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    snapshot_date TEXT NOT NULL UNIQUE,
+    digest TEXT NOT NULL UNIQUE,
+    source_name TEXT,
+    total_rows INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS setup_agg (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+    AREA TEXT,
+    LINE_OF_BUSINESS TEXT,
+    BRANCH_ID,
+    BRANCH_NAME TEXT,
+    total INTEGER NOT NULL,
+    sudah INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS setup_agg_snapshot ON setup_agg(snapshot_id);
+"""
+
+
+def date_from_name(name):
+    """Tanggal dari nama file export (mis. hasil_monitoring17Oct2026.xlsx), atau None."""
+    match = _NAME_DATE.search(name or "")
+    if not match:
+        return None
+    try:
+        return datetime.strptime(match.group(1), "%d%b%Y").date()
+    except ValueError:
+        return None
+
+
+def missing_columns(df):
+    """Kolom wajib yang tidak ada di file (nama header di-strip)."""
+    present = {str(c).strip() for c in df.columns}
+    return [col for col in REQUIRED_COLUMNS if col not in present]
+
+
+def aggregate_setup(df):
+    """Hasil monitoring (baris Branch × LOB) -> jumlah baris & 'Sudah Setup' per kunci."""
+    missing = missing_columns(df)
+    if missing:
+        raise ValueError(f"Kolom tidak ditemukan: {', '.join(missing)}")
+    df = df.copy()
+    df.columns = df.columns.map(lambda c: str(c).strip())
+    for col in AGG_KEYS:
+        if col not in df.columns:
+            df[col] = None
+    return (
+        df.assign(total=1, sudah=df["Status"].eq(STATUS_SUDAH).astype(int))
+        .groupby(AGG_KEYS, dropna=False)[["total", "sudah"]].sum()
+        .reset_index()
+    )
+
+
+class SnapshotStore:
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def has(self, digest):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT 1 FROM snapshots WHERE digest = ?", (digest,)).fetchone() is not None
+
+    def source_at(self, snapshot_date):
+        """Nama file snapshot yang tersimpan di tanggal itu, atau None kalau tanggalnya masih kosong."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT COALESCE(source_name, digest) FROM snapshots WHERE snapshot_date = ?",
+                (snapshot_date.isoformat(),),
+            ).fetchone()
+        return row[0] if row else None
+
+    def ingest(self, df, snapshot_date, digest, source_name=None, replace=False):
+        """Simpan agregat satu file.
+
+        Snapshot file lain di tanggal yang sama hanya diganti kalau `replace`;
+        tanpa itu ValueError, supaya penggantian selalu disengaja.
+        """
+        agg = aggregate_setup(df)
+        with self._lock, closing(self._connect()) as conn, conn:
+            taken = conn.execute(
+                "SELECT digest FROM snapshots WHERE snapshot_date = ?", (snapshot_date.isoformat(),)
+            ).fetchone()
+            if taken and taken[0] != digest and not replace:
+                raise ValueError(f"Tanggal {snapshot_date:%d %b %Y} sudah berisi snapshot lain")
+            conn.execute("DELETE FROM snapshots WHERE snapshot_date = ? OR digest = ?",
+                         (snapshot_date.isoformat(), digest))
+            cur = conn.execute(
+                "INSERT INTO snapshots (snapshot_date, digest, source_name, total_rows, ingested_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (snapshot_date.isoformat(), digest, source_name, len(df), datetime.now().isoformat(timespec="seconds")),
+            )
+            agg.insert(0, "snapshot_id", cur.lastrowid)
+            agg.to_sql("setup_agg", conn, if_exists="append", index=False)
+        return cur.lastrowid
+
+    def snapshots(self):
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(
+                "SELECT snapshot_date AS TANGGAL, source_name AS FILE, total_rows AS BARIS "
+                "FROM snapshots ORDER BY snapshot_date", conn
+            )
+
+    def delete(self, snapshot_date):
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM snapshots WHERE snapshot_date = ?", (snapshot_date,))
+
+    def trend(self, by=None, days=None):
+        """Persentase 'Sudah Setup' per tanggal (dan per `by`) untuk `days` snapshot terakhir."""
+        dim = f"a.{by}, " if by else ""
+        limit = "LIMIT ?" if days else ""
+        query = f"""
+            SELECT s.snapshot_date AS TANGGAL, {dim}SUM(a.total) AS TOTAL, SUM(a.sudah) AS SUDAH
+            FROM setup_agg a JOIN snapshots s ON s.id = a.snapshot_id
+            WHERE s.id IN (SELECT id FROM snapshots ORDER BY snapshot_date DESC {limit})
+            GROUP BY s.snapshot_date{", a." + by if by else ""}
+            ORDER BY s.snapshot_date
+        """
+        with closing(self._connect()) as conn:
+            trend = pd.read_sql_query(query, conn, params=(days,) if days else ())
+        trend["TANGGAL"] = pd.to_datetime(trend["TANGGAL"])
+        trend["Persentase"] = trend["SUDAH"] / trend["TOTAL"].where(trend["TOTAL"] > 0) * 100
+        return trend
@@ -0,0 +1,125 @@
+# Data sintetis untuk benchmark, diskalakan dari template bawaan repo.
+#
+# Skema diambil dari BRANCH.xlsx, WORKINGPAPERBATCH2.xlsx dan COVERCENTRAL.xlsx;
+# jumlah branch dan transaksi per branch bisa diatur. Nilai acak memakai seed,
+# jadi ukuran dan isi data sama setiap kali benchmark dijalankan.
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cpro.monitoring import DEFAULT_LOB_LIST
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent
+BRANCH_TEMPLATE = "BRANCH.xlsx"
+WP_TEMPLATE = "WORKINGPAPERBATCH2.xlsx"
+CENTRAL_TEMPLATE = "COVERCENTRAL.xlsx"
+CENTRAL_COLS = ["COVER CENTRAL CREDIT", "COVER CENTRAL REMEDIAL", "COVER CENTRAL IWM"]
+BRANCHES_PER_AREA = 8
+PRODUCTS = ["MOTOR BARU", "MOTOR BEKAS", "ELEKTRONIK", "MULTIGUNA", "SYARIAH"]
+
+
+def load_templates(template_dir=TEMPLATE_DIR):
+    template_dir = Path(template_dir)
+    return {
+        "branch": pd.read_excel(template_dir / BRANCH_TEMPLATE),
+        "wp": pd.read_excel(template_dir / WP_TEMPLATE),
+        "central": pd.read_excel(template_dir / CENTRAL_TEMPLATE),
+    }
+
+
+def _scaled_names(names, n):
+    # nama template dipakai ulang, diberi nomor setelah putaran pertama
+    names = pd.Series(names).astype(str).to_numpy()
+    rounds = np.arange(n) // len(names)
+    base = names[np.arange(n) % len(names)]
+    return np.where(rounds == 0, base, np.char.add(np.char.add(base.astype(str), " "), (rounds + 1).astype(str)))
+
+
+def synth_branches(templates, n_branches, rng):
+    tpl = templates["branch"]
+    n_area = max(1, int(np.ceil(n_branches / BRANCHES_PER_AREA)))
+    areas = _scaled_names(tpl["AREA"].drop_duplicates(), n_area)
+    return pd.DataFrame({
+        "BRANCH_ID": 70_000 + 100 * np.arange(n_branches, dtype=np.int64),
+        "BRANCH_NAME": _scaled_names(tpl["BRANCH_NAME"], n_branches),
+        "AREA": areas[rng.integers(0, n_area, n_branches)],
+    })
+
+
+def synth_cover_central(templates, branches, rng):
+    tpl = templates["central"]
+    out = pd.DataFrame({"ID CABANG": branches["BRANCH_ID"], "NAMA CABANG": branches["BRANCH_NAME"]})
+    for col in CENTRAL_COLS:
+        values = tpl[col].dropna().to_numpy()
+        out[col] = values[rng.integers(0, len(values), len(branches))]
+    return out
+
+
+def synth_realisasi(branches, rng, coverage=0.7, lob_list=DEFAULT_LOB_LIST):
+    """Baris realisasi setup untuk sebagian (coverage) pasangan Branch × LOB."""
+    n_lob = len(lob_list)
+    picked = np.flatnonzero(rng.random(len(branches) * n_lob) < coverage)
+    return pd.DataFrame({
+        "BRANCH_ID": branches["BRANCH_ID"].to_numpy()[picked // n_lob],
+        "LINE_OF_BUSINESS": np.asarray(lob_list, dtype=object)[picked % n_lob],
+        "EMPLOYEE_NUMBER": rng.integers(10_000_000, 99_999_999, len(picked)),
+    })
+
+
+def synth_progress(templates, branches, rng, fill=0.5):
+    """WPProgress untuk sebagian (fill) pasangan Branch × WP, teks CI sedikit diacak formatnya."""
+    wp = templates["wp"]
+    n_wp = len(wp)
+    picked = np.flatnonzero(rng.random(len(branches) * n_wp) < fill)
+    b, w = picked // n_wp, picked % n_wp
+    n = len(picked)
+    ci = wp["COMPLIANCE_INDICATOR"].astype(str).to_numpy()
+    # variasi spasi/kapital seperti input asli, hasil normalisasinya tetap sama
+    ci_variants = np.stack([ci, np.char.upper(ci.astype(str)), np.char.add("  ", ci.astype(str))])
+    return pd.DataFrame({
+        "BRANCH_ID": branches["BRANCH_ID"].to_numpy()[b],
+        "AREA": branches["AREA"].to_numpy()[b],
+        "BRANCH_NAME": branches["BRANCH_NAME"].to_numpy()[b],
+        "COMPANY_ID": wp["COMPANY_ID"].to_numpy()[w],
+        "LINE_OF_BUSINESS": wp["LINE_OF_BUSINESS"].to_numpy()[w],
+        "SUB_WP": wp["SUB_WP"].to_numpy()[w],
+        "PROCESS": wp["PROCESS"].to_numpy()[w],
+        "COMPLIANCE_INDICATOR": ci_variants[rng.integers(0, 3, n), w],
+        "PIC": rng.integers(10_000_000, 99_999_999, n),
+        "SCORE_COMPLIANCE_INDICATOR": rng.integers(0, 2, n),
+        "TOTAL_SAMPLE": rng.integers(0, 5, n),
+        "SCORE": rng.integers(0, 101, n),
+        "STATUS": np.where(rng.random(n) < 0.6, "SUBMIT", "DRAFT"),
+        "EVIDENCE_FILE_NAME": np.char.add("evidence_", np.arange(n).astype(str)),
+    })
+
+
+def synth_transactions(branches, rng, per_branch=(1_000, 1_000)):
+    """Data utama halaman Random Sampling: `per_branch` = (min, max) baris per cabang."""
+    low, high = per_branch
+    counts = rng.integers(low, high + 1, len(branches))
+    n = int(counts.sum())
+    return pd.DataFrame({
+        "NO KONTRAK": np.arange(1, n + 1, dtype=np.int64) + 10 ** 11,
+        "ID CABANG": np.repeat(branches["BRANCH_ID"].to_numpy(), counts),
+        "PERIODE": rng.integers(202401, 202413, n),
+        "PRODUK": np.asarray(PRODUCTS, dtype=object)[rng.integers(0, len(PRODUCTS), n)],
+        "NILAI": rng.integers(1_000_000, 50_000_000, n),
+    })
+
+
+def generate(n_branches, per_branch=(1_000, 1_000), seed=0, progress_fill=0.5, setup_coverage=0.7,
+             templates=None):
+    """Semua input halaman untuk `n_branches` cabang: {nama: DataFrame}."""
+    templates = templates or load_templates()
+    rng = np.random.default_rng(seed)
+    branches = synth_branches(templates, n_branches, rng)
+    return {
+        "branch": branches,
+        "wp": templates["wp"],
+        "central": synth_cover_central(templates, branches, rng),
+        "realisasi": synth_realisasi(branches, rng, setup_coverage),
+        "progress": synth_progress(templates, branches, rng, progress_fill),
+        "transactions": synth_transactions(branches, rng, per_branch),
+    }
@@ -0,0 +1,150 @@
+# Template Excel untuk halaman File Repository.
+#
+# File bawaan repo langsung dilayani dari disk (bytes di-cache di memori).
+# Versi terbaru dari GitHub diambil di background lewat satu Session dengan
+# timeout dan revalidasi ETag/If-Modified-Since, jadi halaman tidak pernah
+# menunggu jaringan dan tetap jalan offline.
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+TEMPLATE_FILES = {
+    "📌 Branch File": "BRANCH.xlsx",
+    "📌 Workingpaper File": "WORKINGPAPERBATCH2.xlsx",
+    "📌 Cover Central File": "COVERCENTRAL.xlsx",
+}
+REMOTE_BASE = "https://raw.githubusercontent.com/andi-arch1/randomsampling/main/"
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+DEFAULT_TIMEOUT = (3, 15)  # (connect, read) detik
+DEFAULT_REFRESH_INTERVAL = 3600
+XLSX_SIGNATURE = b"PK\x03\x04"  # xlsx = arsip zip
+
+
+class TemplateStore:
+    def __init__(self, bundled_dir, cache_dir=None, remote_base=REMOTE_BASE,
+                 timeout=DEFAULT_TIMEOUT, refresh_interval=DEFAULT_REFRESH_INTERVAL):
+        self.bundled_dir = Path(bundled_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.remote_base = remote_base
+        self.timeout = timeout
+        self.refresh_interval = refresh_interval
+        self._bytes = {}
+        self._meta = self._load_meta()
+        self._lock = threading.Lock()
+        self._session = None
+        self._refreshing = None
+        self._last_refresh = 0.0
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # ---------- BACA ----------
+    def _path(self, name):
+        if self.cache_dir is not None and (self.cache_dir / name).exists():
+            return self.cache_dir / name
+        return self.bundled_dir / name
+
+    def get(self, name):
+        """Isi file template (versi hasil refresh kalau ada), atau None kalau tidak ada."""
+        data = self._bytes.get(name)
+        if data is None:
+            path = self._path(name)
+            if not path.exists():
+                return None
+            data = path.read_bytes()
+            with self._lock:
+                self._bytes[name] = data
+        return data
+
+    # ---------- REFRESH DARI REMOTE ----------
+    def _meta_path(self):
+        return self.cache_dir / "templates.json" if self.cache_dir is not None else None
+
+    def _load_meta(self):
+        path = self._meta_path()
+        if path is None or not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _get_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=len(TEMPLATE_FILES), max_retries=1)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def _fetch(self, name):
+        import requests
+
+        meta = self._meta.get(name, {})
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            response = self._get_session().get(self.remote_base + name, headers=headers, timeout=self.timeout)
+        except requests.RequestException:
+            return "error"
+        if response.status_code == 304:
+            return "not modified"
+        if response.status_code != 200:
+            return f"HTTP {response.status_code}"
+        if not response.content.startswith(XLSX_SIGNATURE):
+            return "invalid"  # mis. halaman HTML captive portal; versi lama tetap dipakai
+
+        target = self.cache_dir / name
+        tmp = target.with_suffix(target.suffix + ".tmp")
+        try:
+            tmp.write_bytes(response.content)
+            os.replace(tmp, target)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return "write error"
+        with self._lock:
+            self._bytes[name] = response.content
+            self._meta[name] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+        return "updated"
+
+    def refresh(self):
+        """Ambil semua template dari remote secara paralel; hasil: {nama: status}."""
+        if self.cache_dir is None or not self.remote_base:
+            return {}
+        names = list(TEMPLATE_FILES.values())
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            status = dict(zip(names, pool.map(self._fetch, names)))
+        path = self._meta_path()
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with self._lock:
+            try:
+                tmp.write_text(json.dumps(self._meta), encoding="utf-8")
+                os.replace(tmp, path)
+            except OSError:
+                # disk penuh/read-only: ETag tidak tersimpan, template tetap dipakai dari memori
+                tmp.unlink(missing_ok=True)
+                status[path.name] = "write error"
+        self._last_refresh = time.monotonic()
+        return status
+
+    def refresh_async(self):
+        """Jalankan refresh di thread background kalau sudah lewat interval."""
+        with self._lock:
+            if self._refreshing is not None and self._refreshing.is_alive():
+                return
+            if self._last_refresh and time.monotonic() - self._last_refresh < self.refresh_interval:
+                return
+            self._last_refresh = time.monotonic()
+            self._refreshing = threading.Thread(target=self.refresh, name="template-refresh", daemon=True)
+            self._refreshing.start()
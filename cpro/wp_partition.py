@@ -0,0 +1,200 @@
+# WP Progress out-of-core: Branch dipecah per AREA (atau per potongan branch).
+#
+# Setiap partisi diproses oleh WPProgressEngine-nya sendiri (hanya branch di
+# partisi itu + baris WPProgress miliknya), baris `cleaned`-nya di-spill ke
+# Parquet di folder kerja, dan yang tetap di memori hanya cube agregatnya.
+# Cube semua partisi digabung untuk grafik & tabel progress; baris lengkap
+# dibaca ulang per file saat ditampilkan atau diekspor. Puncak memori
+# mengikuti partisi terbesar, bukan seluruh Branch × WP.
+import multiprocessing
+import shutil
+import tempfile
+import weakref
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from cpro.wp_progress import (
+    CUBE_DIMS, CUBE_MEASURES, DEFAULT_CHUNK_ROWS, DEFAULT_CODEBOOK, DESIRED_COLS, CubeQueries, WPProgressEngine
+)
+
+DEFAULT_PARTITION_BRANCHES = 500  # partisi AREA yang lebih besar dipecah lagi
+
+
+def plan_partitions(df_branch, by="AREA", max_branches=DEFAULT_PARTITION_BRANCHES):
+    """[(nilai `by` atau None, posisi baris Branch)], urut kemunculan pertama.
+
+    `by=None` memotong Branch berurutan per `max_branches` (urutan hasil sama
+    dengan engine biasa). Branch dengan `by` kosong dikumpulkan di partisi None.
+    """
+    positions = np.arange(len(df_branch))
+    if by is None or by not in df_branch.columns:
+        groups = [(None, positions)]
+    else:
+        codes, uniques = pd.factorize(df_branch[by])
+        order = np.argsort(np.where(codes < 0, len(uniques), codes), kind="stable")
+        bounds = np.flatnonzero(np.diff(codes[order])) + 1
+        groups = [
+            (uniques[codes[part[0]]] if codes[part[0]] >= 0 else None, part)
+            for part in np.split(order, bounds) if len(part)
+        ]
+    step = max_branches or len(df_branch) or 1
+    return [(key, part[i:i + step]) for key, part in groups for i in range(0, len(part), step)]
+
+
+def _progress_rows(df_branch, df_progress, partitions):
+    # posisi baris WPProgress per partisi lewat BRANCH_ID (branch dobel di dua partisi ikut keduanya)
+    if not partitions:
+        return {}
+    owner = pd.DataFrame({
+        "BRANCH_ID": df_branch["BRANCH_ID"].to_numpy()[np.concatenate([pos for _, pos in partitions])],
+        "_part": np.repeat(np.arange(len(partitions)), [len(pos) for _, pos in partitions]),
+    }).drop_duplicates()
+    rows = pd.DataFrame({
+        "BRANCH_ID": df_progress["BRANCH_ID"].to_numpy(), "_row": np.arange(len(df_progress)),
+    }).merge(owner, on="BRANCH_ID")
+    return {part: np.sort(group.to_numpy()) for part, group in rows.groupby("_part")["_row"]}
+
+
+def _write_chunk(chunk, stem):
+    # kolom teks campuran (mis. BRANCH_ID angka & "KC-01") tidak bisa jadi Parquet: simpan pickle
+    path = stem.with_suffix(".parquet")
+    try:
+        chunk.to_parquet(path, index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        path.unlink(missing_ok=True)
+        path = stem.with_suffix(".pkl")
+        chunk.to_pickle(path)
+    return str(path)
+
+
+def _read_chunk(path):
+    if path.endswith(".pkl"):
+        return pd.read_pickle(path)[DESIRED_COLS]
+    return pd.read_parquet(path, columns=DESIRED_COLS)
+
+
+def _run_partition(number, area, df_branch, df_wp, df_progress, folder, chunk_rows, codebook=DEFAULT_CODEBOOK):
+    # top-level supaya bisa dijalankan di worker; tipe kolom WPProgress dipaksa sama di semua partisi
+    engine = WPProgressEngine(df_branch, df_wp, df_progress, codebook=codebook, upcast_progress=True)
+    files, rows = [], 0
+    for i, chunk in enumerate(engine.iter_rows(chunk_rows=chunk_rows)):
+        files.append(_write_chunk(chunk, Path(folder) / f"part-{number:05d}-{i:04d}"))
+        rows += len(chunk)
+    return {
+        "area": area,
+        "branches": len(df_branch),
+        "rows": rows,
+        "files": files,
+        "cube": engine.cube,
+        "ci_collisions": engine.ci_collisions,
+    }
+
+
+def _run_all(tasks, workers):
+    # hasil berurutan; paling banyak 2 × workers partisi menunggu supaya salinan input tidak menumpuk
+    if workers <= 1:
+        for task in tasks:
+            yield _run_partition(*task)
+        return
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(_run_partition, *task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def combine_cubes(cubes):
+    """Gabung cube per partisi (kamus kategori tiap partisi boleh berbeda)."""
+    if not cubes:
+        return pd.DataFrame(columns=CUBE_DIMS + CUBE_MEASURES)
+    return (
+        pd.concat(cubes, ignore_index=True)
+        .groupby(CUBE_DIMS, dropna=False, sort=False, observed=True)[CUBE_MEASURES].sum()
+        .reset_index()
+    )
+
+
+class PartitionedWP(CubeQueries):
+    """Hasil WP Progress per partisi, dengan API baca yang sama seperti WPProgressEngine.
+
+    `workers > 1` memproses partisi paralel di process pool (codebook CI di
+    worker tidak dipersist). `progress(done, total, message)` dipanggil
+    setiap partisi selesai. Folder spill dihapus saat objek dibuang atau
+    lewat `close()`.
+    """
+
+    def __init__(self, df_branch, df_wp, df_progress, codebook=DEFAULT_CODEBOOK, by="AREA",
+                 max_branches=DEFAULT_PARTITION_BRANCHES, workers=1, spill_dir=None, chunk_rows=DEFAULT_CHUNK_ROWS,
+                 progress=None):
+        if spill_dir is not None:
+            Path(spill_dir).mkdir(parents=True, exist_ok=True)
+        self.folder = Path(tempfile.mkdtemp(prefix="wp-parts-", dir=spill_dir))
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.folder, True)
+
+        df_branch = df_branch.reset_index(drop=True)
+        df_progress = df_progress.reset_index(drop=True)
+        partitions = plan_partitions(df_branch, by, max_branches)
+        progress_rows = _progress_rows(df_branch, df_progress, partitions)
+        empty = np.zeros(0, dtype=np.int64)
+        tasks = (
+            (number, area, df_branch.iloc[pos], df_wp, df_progress.iloc[progress_rows.get(number, empty)],
+             str(self.folder), chunk_rows, *((codebook,) if workers <= 1 else ()))
+            for number, (area, pos) in enumerate(partitions)
+        )
+
+        self.parts, cubes, self.ci_collisions = [], [], {}
+        progress = progress or (lambda *args: None)
+        progress(0, len(partitions), f"{len(partitions)} partisi")
+        try:
+            for result in _run_all(tasks, workers):
+                cubes.append(result.pop("cube"))
+                for code, texts in result.pop("ci_collisions").items():
+                    self.ci_collisions.setdefault(code, [])
+                    self.ci_collisions[code] += [t for t in texts if t not in self.ci_collisions[code]]
+                self.parts.append(result)
+                label = result["area"] if result["area"] is not None else "tanpa AREA"
+                progress(len(self.parts), len(partitions), f"Partisi {len(self.parts)}/{len(partitions)} ({label})")
+        except BaseException:
+            self.close()  # gagal/dibatalkan: file spill tidak ditinggal
+            raise
+        self.n_rows = sum(part["rows"] for part in self.parts)
+        self._set_cube(combine_cubes(cubes))
+
+    def iter_rows(self, areas=None, lobs=None, chunk_rows=None):
+        """Baris hasil yang sudah difilter, dibaca per file Parquet (partisi AREA lain dilewati)."""
+        for part in self.parts:
+            if areas is not None and part["area"] is not None and part["area"] not in areas:
+                continue
+            for path in part["files"]:
+                chunk = _read_chunk(path)
+                mask = np.ones(len(chunk), dtype=bool)
+                if areas is not None:
+                    mask &= chunk["AREA"].isin(areas).to_numpy()
+                if lobs is not None:
+                    mask &= chunk["LINE_OF_BUSINESS"].isin(lobs).to_numpy()
+                if mask.any():
+                    yield chunk[mask]
+
+    def to_frame(self, areas=None, lobs=None):
+        parts = list(self.iter_rows(areas, lobs))
+        return pd.concat(parts) if parts else pd.DataFrame(columns=DESIRED_COLS)
+
+    def close(self):
+        self._finalizer()
+
+
+def build_engine(df_branch, df_wp, df_progress, codebook=DEFAULT_CODEBOOK, partitioned=False, spill_dir=None,
+                 progress=None):
+    """WPProgressEngine biasa, atau PartitionedWP per AREA kalau `partitioned`."""
+    if partitioned:
+        return PartitionedWP(df_branch, df_wp, df_progress, codebook=codebook, spill_dir=spill_dir,
+                             progress=progress)
+    return WPProgressEngine(df_branch, df_wp, df_progress, codebook=codebook, progress=progress)
@@ -0,0 +1,369 @@
+# Monitoring WP Progress tanpa materialisasi cross join Branch × WP.
+#
+# Hasil `cleaned` halaman WP adalah Branch × WP (left join ke WPProgress).
+# Engine ini hanya menyimpan pasangan yang benar-benar punya baris WPProgress
+# ("links": branch, wp, progress). Baris lain cukup dihitung; baris lengkap
+# baru dibentuk per potongan branch saat ditampilkan atau diekspor.
+import numpy as np
+import pandas as pd
+
+from cpro.ci_codes import CICodeBook
+from cpro.filter_index import FilterIndex
+from cpro.schema import NUMBER, TEXT, key_codes, unify_categories
+
+MERGE_KEYS = ["BRANCH_ID", "LINE_OF_BUSINESS", "SUB_WP", "PROCESS", "CI_CODE"]
+WP_KEYS = ["LINE_OF_BUSINESS", "SUB_WP", "PROCESS", "CI_CODE"]
+COALESCE_COLS = ["AREA", "COMPANY_ID", "BRANCH_NAME", "EVIDENCE_FILE_NAME"]
+DESIRED_COLS = [
+    "BRANCH_ID", "BRANCH_NAME", "AREA",
+    "COMPANY_ID",
+    "LINE_OF_BUSINESS", "SUB_WP", "PROCESS",
+    "COMPLIANCE_INDICATOR", "INSPECTION_CATEGORY",
+    "PIC", "SCORE_COMPLIANCE_INDICATOR", "TOTAL_SAMPLE",
+    "SCORE", "STATUS", "EVIDENCE_FILE_NAME"
+]
+# kolom yang dibaca dari ketiga upload (kunci merge + kolom output), dengan tipenya
+INPUT_COLUMNS = {
+    "BRANCH_ID": TEXT, "BRANCH_NAME": TEXT, "AREA": TEXT,
+    "COMPANY_ID": TEXT,
+    "LINE_OF_BUSINESS": TEXT, "SUB_WP": TEXT, "PROCESS": TEXT,
+    "COMPLIANCE_INDICATOR": TEXT, "INSPECTION_CATEGORY": TEXT,
+    "PIC": TEXT, "SCORE_COMPLIANCE_INDICATOR": NUMBER, "TOTAL_SAMPLE": NUMBER,
+    "SCORE": NUMBER, "STATUS": TEXT, "EVIDENCE_FILE_NAME": TEXT,
+}
+# kolom yang dipakai grafik & tabel progress
+AGG_COLS = ["AREA", "BRANCH_NAME", "LINE_OF_BUSINESS", "STATUS", "SCORE"]
+CUBE_DIMS = ["AREA", "LINE_OF_BUSINESS", "BRANCH_NAME", "STATUS"]
+CUBE_MEASURES = ["ROWS", "SCORE_SUM", "SCORE_N"]
+SUBMIT = "SUBMIT"
+DEFAULT_CHUNK_ROWS = 200_000
+
+
+# CI_CODE dihitung sekali per teks unik (lihat ci_codes.py)
+DEFAULT_CODEBOOK = CICodeBook()
+
+
+def add_ci_code(df, codebook=DEFAULT_CODEBOOK):
+    df["CI_CODE"] = codebook.encode(df["COMPLIANCE_INDICATOR"])
+    return df
+
+
+# ---------- BERSIHKAN DUPLIKAT KOLUMN (hilangkan _x/_y) ----------
+def coalesce_cols(df, bases):
+    for base in bases:
+        cx, cy = f"{base}_x", f"{base}_y"
+        if cx in df.columns and cy in df.columns:
+            df[base] = df[cx].combine_first(df[cy])
+            df.drop(columns=[cx, cy], inplace=True)
+        elif cx in df.columns:
+            df.rename(columns={cx: base}, inplace=True)
+        elif cy in df.columns:
+            df.rename(columns={cy: base}, inplace=True)
+
+
+def clean_merged(merged):
+    # Simpan teks asli compliance indicator (biar tetap bisa dibaca panjangnya)
+    merged["COMPLIANCE_TEXT"] = merged["COMPLIANCE_INDICATOR_x"].combine_first(merged["COMPLIANCE_INDICATOR_y"])
+    merged.drop(columns=["COMPLIANCE_INDICATOR_x", "COMPLIANCE_INDICATOR_y"], inplace=True)
+    merged.rename(columns={"COMPLIANCE_TEXT": "COMPLIANCE_INDICATOR"}, inplace=True)
+
+    # satukan kolom yang berpotensi dobel
+    coalesce_cols(merged, COALESCE_COLS)
+
+    for c in DESIRED_COLS:
+        if c not in merged.columns:
+            merged[c] = pd.NA
+
+    # ---------- BUSINESS RULE: Kalau TOTAL_SAMPLE = 0, maka SCORE = 100 ----------
+    # (diterapkan ke `merged` langsung, jadi cukup satu salinan saat pilih kolom)
+    merged.loc[
+        (merged["TOTAL_SAMPLE"].fillna(0).astype(float).astype(int) == 0),
+        "SCORE"
+    ] = 100
+    return merged[DESIRED_COLS]
+
+
+def _suffixed(left_cols, right_cols, on):
+    # nama kolom hasil pd.merge (suffix _x/_y untuk kolom non-key yang dobel)
+    overlap = (set(left_cols) & set(right_cols)) - set(on)
+    left = [(f"{c}_x" if c in overlap else c, c) for c in left_cols]
+    right = [(f"{c}_y" if c in overlap else c, c) for c in right_cols if c not in on]
+    return left, right
+
+
+def _merged_layout(branch_cols, wp_cols, progress_cols):
+    """[(nama kolom di merged, sumber 'b'/'w'/'p', kolom sumber)] seperti dua merge lama."""
+    branch_cols = [c for c in branch_cols if c != "key"]
+    wp_cols = [c for c in wp_cols if c not in ("key", "CI_CODE")]
+    b_part, w_part = _suffixed(branch_cols, wp_cols, [])
+    cross = [(name, "b", col) for name, col in b_part] + [(name, "w", col) for name, col in w_part]
+    cross += [("CI_CODE", "w", "CI_CODE")]
+
+    left, right = _suffixed([name for name, _, _ in cross], list(progress_cols), MERGE_KEYS)
+    layout = [(name, src, col) for (name, _), (_, src, col) in zip(left, cross)]
+    layout += [(name, "p", col) for name, col in right]
+    return layout
+
+
+class CubeQueries:
+    """Grafik & tabel progress dari cube agregat (AREA × LOB × BRANCH × STATUS)."""
+
+    def _set_cube(self, cube):
+        self.cube = cube
+        # index filter Area/LOB, dibangun sekali per cube
+        self._cube_index = FilterIndex(cube, ["AREA", "LINE_OF_BUSINESS"])
+
+    def _slice(self, areas=None, lobs=None):
+        rows = self._cube_index.rows({"AREA": areas, "LINE_OF_BUSINESS": lobs})
+        return FilterIndex.take(self.cube, rows)
+
+    def area_options(self):
+        return self._cube_index.options("AREA")
+
+    def lob_options(self, areas=None):
+        return self._cube_index.options("LINE_OF_BUSINESS", {"AREA": areas})
+
+    def count(self, areas=None, lobs=None):
+        return int(self._slice(areas, lobs)["ROWS"].sum())
+
+    def status_counts(self, areas=None, lobs=None):
+        c = self._slice(areas, lobs)
+        c = c[c["STATUS"].notna()]
+        counts = (
+            c.groupby(c["STATUS"].astype(str).str.strip(), sort=False, observed=True)["ROWS"].sum()
+            .sort_values(ascending=False, kind="stable")
+            .reset_index()
+        )
+        counts.columns = ["STATUS", "JUMLAH"]
+        return counts
+
+    def score_by_lob(self, areas=None, lobs=None):
+        g = (
+            self._slice(areas, lobs)
+            .groupby("LINE_OF_BUSINESS", dropna=False, observed=True)[["SCORE_SUM", "SCORE_N"]].sum()
+        )
+        return (g["SCORE_SUM"] / g["SCORE_N"].replace(0, np.nan)).rename("SCORE").reset_index()
+
+    def _progress_by(self, col, areas=None, lobs=None):
+        c = self._slice(areas, lobs)
+        submit = c["ROWS"].where(c["STATUS"].eq(SUBMIT), 0)
+        return (
+            pd.DataFrame({col: c[col], "TOTAL": c["ROWS"], "SUBMIT": submit})
+            .groupby(col, observed=True)[["TOTAL", "SUBMIT"]].sum()
+        )
+
+    def area_progress(self, areas=None, lobs=None):
+        g = self._progress_by("AREA", areas, lobs)
+        return (g["SUBMIT"] / g["TOTAL"] * 100).rename("Persentase").reset_index()
+
+    def branch_progress(self, areas=None, lobs=None):
+        g = self._progress_by("BRANCH_NAME", areas, lobs)
+        return pd.DataFrame({
+            "BRANCH_NAME": g.index,
+            "Jumlah Data": g["TOTAL"].to_numpy(),
+            "Jumlah SUBMIT": g["SUBMIT"].to_numpy(),
+            "Persentase (%)": (g["SUBMIT"] / g["TOTAL"] * 100).to_numpy(),
+        })
+
+
+class WPProgressEngine(CubeQueries):
+    def __init__(self, df_branch, df_wp, df_progress, codebook=DEFAULT_CODEBOOK, upcast_progress=None,
+                 progress=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        # `progress(done, total, message)` dipanggil per tahap dan per potongan ringkasan
+        # (titik batal untuk job background, lihat jobs.py)
+        progress = progress or (lambda *args: None)
+        progress(0, None, "Menyiapkan kode CI...")
+        # reset_index sudah menghasilkan salinan; frame milik pemanggil tidak diubah
+        self.branch = df_branch.reset_index(drop=True)
+        self.wp = add_ci_code(df_wp.reset_index(drop=True), codebook)
+        self.progress = add_ci_code(df_progress.reset_index(drop=True), codebook)
+        self.ci_collisions = codebook.collisions_in([self.wp["CI_CODE"], self.progress["CI_CODE"]])
+        codebook.save()
+        unify_categories([self.branch, self.wp, self.progress])
+        self.n_branch, self.n_wp = len(self.branch), len(self.wp)
+
+        layout = _merged_layout(self.branch.columns, self.wp.columns, self.progress.columns)
+        needed = {"COMPLIANCE_INDICATOR_x", "COMPLIANCE_INDICATOR_y"}
+        for c in DESIRED_COLS:
+            needed.update({c, f"{c}_x", f"{c}_y"})
+        self._layout = [item for item in layout if item[0] in needed]
+
+        progress(0, None, "Mencocokkan baris WPProgress...")
+        self._build_links()
+
+        # kolom WPProgress ikut di-upcast seperti hasil left join yang punya baris kosong
+        # (`upcast_progress` memaksa keputusan ini, mis. supaya semua partisi bertipe sama)
+        if upcast_progress is None:
+            upcast_progress = self.n_rows > len(self._link_p)
+        if upcast_progress:
+            for name, src, col in self._layout:
+                if src == "p":
+                    self.progress[col] = self.progress[col].astype(
+                        self.progress[col].iloc[:0].reindex([0]).dtype
+                    )
+
+        self._area_pushdown = "AREA" in self.branch.columns and "AREA" not in self.wp.columns
+        self._set_cube(self._build_cube(self._build_summary(progress, chunk_rows)))
+        self._wp_index = FilterIndex(self.wp, ["LINE_OF_BUSINESS"])
+        self._branch_index = FilterIndex(self.branch, ["AREA"]) if self._area_pushdown else None
+
+    # ---------- INDEX PASANGAN YANG PUNYA PROGRESS ----------
+    def _build_links(self):
+        # merge pada kode integer (kamus categorical sama di ketiga frame)
+        wp_keys = key_codes(self.wp, WP_KEYS).assign(_w=np.arange(self.n_wp))
+        br_keys = key_codes(self.branch, ["BRANCH_ID"]).assign(_b=np.arange(self.n_branch))
+        pr_keys = key_codes(self.progress, MERGE_KEYS).assign(_p=np.arange(len(self.progress)))
+        links = (
+            pr_keys.merge(wp_keys, on=WP_KEYS)
+            .merge(br_keys, on="BRANCH_ID")[["_b", "_w", "_p"]]
+            .sort_values(["_b", "_w", "_p"])
+        )
+        pair = links["_b"].to_numpy(np.int64) * self.n_wp + links["_w"].to_numpy(np.int64)
+        self._link_p = links["_p"].to_numpy(np.int64)
+        self._pairs, self._pair_start, self._pair_count = np.unique(
+            pair, return_index=True, return_counts=True
+        )
+        # baris tambahan (match > 1) sebelum tiap pasangan, untuk nomor index asli
+        extra = self._pair_count - 1
+        self._extra_before = np.concatenate([[0], np.cumsum(extra)])
+        # sentinel di ujung supaya hasil searchsorted selalu valid
+        self._pairs_ext = np.append(self._pairs, np.iinfo(np.int64).max)
+        self._count_ext = np.append(self._pair_count, 1)
+        self._start_ext = np.append(self._pair_start, 0)
+        self.n_rows = self.n_branch * self.n_wp + int(extra.sum())
+
+    def _expand_pairs(self, pairs):
+        # pasangan (urut naik) -> baris: branch, wp, progress (-1 = tidak ada), label index asli
+        i = np.searchsorted(self._pairs, pairs)
+        hit = self._pairs_ext[i] == pairs
+        mult = np.where(hit, self._count_ext[i], 1)
+
+        row_pair = np.repeat(pairs, mult)
+        rank = np.arange(len(row_pair)) - np.repeat(np.cumsum(mult) - mult, mult)
+        row_hit = np.repeat(hit, mult)
+        row_p = np.full(len(row_pair), -1, dtype=np.int64)
+        start = np.repeat(self._start_ext[i], mult)
+        row_p[row_hit] = self._link_p[start[row_hit] + rank[row_hit]]
+        labels = row_pair + np.repeat(self._extra_before[i], mult) + rank
+        return row_pair // self.n_wp, row_pair % self.n_wp, row_p, labels
+
+    def _materialize(self, row_b, row_w, row_p, labels=None):
+        frames = {"b": (self.branch, row_b), "w": (self.wp, row_w)}
+        data = {}
+        for name, src, col in self._layout:
+            if src == "p":
+                data[name] = self.progress[col].reindex(row_p).reset_index(drop=True)
+            else:
+                frame, idx = frames[src]
+                data[name] = frame[col].take(idx).reset_index(drop=True)
+        merged = pd.DataFrame(data)
+        cleaned = clean_merged(merged)
+        if labels is not None:
+            cleaned.index = pd.Index(labels)
+        return cleaned
+
+    # ---------- PILIH BRANCH/WP SESUAI FILTER ----------
+    def _select(self, areas=None, lobs=None):
+        b_sel = np.arange(self.n_branch)
+        w_sel = np.arange(self.n_wp)
+        if lobs is not None:
+            w_sel = self._wp_index.rows({"LINE_OF_BUSINESS": lobs})
+        if areas is not None and self._area_pushdown:
+            # AREA kosong di Branch bisa terisi dari WPProgress, jadi tetap ikut
+            b_sel = self._branch_index.rows({"AREA": areas}, missing=["AREA"])
+        return b_sel, w_sel
+
+    def iter_rows(self, areas=None, lobs=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Hasil `cleaned` yang sudah difilter, dibentuk bertahap per potongan branch."""
+        b_sel, w_sel = self._select(areas, lobs)
+        if len(b_sel) == 0 or len(w_sel) == 0:
+            return
+        step = max(1, chunk_rows // len(w_sel))
+        for start in range(0, len(b_sel), step):
+            b_chunk = b_sel[start:start + step]
+            pairs = (b_chunk[:, None] * self.n_wp + w_sel[None, :]).ravel()
+            chunk = self._materialize(*self._expand_pairs(pairs))
+            mask = np.ones(len(chunk), dtype=bool)
+            if areas is not None:
+                mask &= chunk["AREA"].isin(areas).to_numpy()
+            if lobs is not None:
+                mask &= chunk["LINE_OF_BUSINESS"].isin(lobs).to_numpy()
+            if mask.any():
+                yield chunk[mask]
+
+    def head(self, n, areas=None, lobs=None):
+        parts, remaining = [], n
+        for chunk in self.iter_rows(areas, lobs, chunk_rows=max(n, 1000)):
+            parts.append(chunk.iloc[:remaining])
+            remaining -= len(parts[-1])
+            if remaining <= 0:
+                break
+        return pd.concat(parts) if parts else self.empty_frame()
+
+    def to_frame(self, areas=None, lobs=None):
+        parts = list(self.iter_rows(areas, lobs))
+        return pd.concat(parts) if parts else self.empty_frame()
+
+    def empty_frame(self):
+        empty = np.zeros(0, dtype=np.int64)
+        return self._materialize(empty, empty, empty, empty)
+
+    # ---------- RINGKASAN BERBOBOT (BAHAN CUBE) ----------
+    def _build_summary(self, progress, chunk_rows):
+        # baris yang punya progress diambil apa adanya; baris tanpa progress
+        # diwakili satu baris per (branch, kelompok WP) dengan bobot ROWS
+        group_cols = [c for c in ["LINE_OF_BUSINESS", "AREA", "BRANCH_NAME", "STATUS", "SCORE", "TOTAL_SAMPLE"]
+                      if c in self.wp.columns]
+        wp_group = self.wp.groupby(group_cols, dropna=False, sort=False, observed=True).ngroup().to_numpy()
+        n_group = int(wp_group.max()) + 1 if len(wp_group) else 0
+        group_size = np.bincount(wp_group, minlength=n_group)
+        group_rep = np.full(n_group, -1, dtype=np.int64)
+        group_rep[wp_group[::-1]] = np.arange(self.n_wp)[::-1]
+
+        link_b = self._pairs // max(self.n_wp, 1)
+        link_w = self._pairs % max(self.n_wp, 1)
+        matched = np.zeros((self.n_branch, n_group), dtype=np.int64)
+        np.add.at(matched, (link_b, wp_group[link_w]), 1)
+        unmatched = group_size[None, :] - matched
+
+        ub, ug = np.nonzero(unmatched)
+        pairs_b = np.repeat(link_b, self._pair_count)
+        pairs_w = np.repeat(link_w, self._pair_count)
+        pairs_p = self._link_p
+
+        row_b = np.concatenate([pairs_b, ub])
+        row_w = np.concatenate([pairs_w, group_rep[ug]])
+        row_p = np.concatenate([pairs_p, np.full(len(ub), -1, dtype=np.int64)])
+        weight = np.concatenate([np.ones(len(pairs_p), dtype=np.int64), unmatched[ub, ug]])
+
+        # dibentuk per potongan baris supaya progress & batal tidak menunggu seluruh ringkasan
+        step = chunk_rows or max(len(row_b), 1)
+        starts = range(0, max(len(row_b), 1), step)
+        parts = []
+        for i, start in enumerate(starts):
+            progress(i, len(starts) + 1, f"Ringkasan {i + 1}/{len(starts)}")
+            rows = slice(start, start + step)
+            parts.append(self._materialize(row_b[rows], row_w[rows], row_p[rows])[AGG_COLS])
+        summary = pd.concat(parts, ignore_index=True)
+        summary["ROWS"] = weight
+        progress(len(starts), len(starts) + 1, "Menyusun cube & index filter...")
+        return summary
+
+    # ---------- CUBE AGREGASI (AREA × LOB × BRANCH × STATUS) ----------
+    def _build_cube(self, summary):
+        score = pd.to_numeric(summary["SCORE"], errors="coerce")
+        rows = summary["ROWS"]
+        cube = (
+            pd.DataFrame({
+                "AREA": summary["AREA"],
+                "LINE_OF_BUSINESS": summary["LINE_OF_BUSINESS"],
+                "BRANCH_NAME": summary["BRANCH_NAME"],
+                "STATUS": summary["STATUS"],
+                "ROWS": rows,
+                "SCORE_SUM": score.fillna(0) * rows,
+                "SCORE_N": rows.where(score.notna(), 0),
+            })
+            .groupby(CUBE_DIMS, dropna=False, sort=False, observed=True)[CUBE_MEASURES].sum()
+            .reset_index()
+        )
+        return cube
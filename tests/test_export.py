@@ -0,0 +1,14 @@
+import io
+
+import pandas as pd
+
+from cpro.export import export_bytes
+
+
+def test_parquet_accepts_mixed_object_columns():
+    df = pd.DataFrame({"BRANCH_ID": [70100, "KC-01", None], "TOTAL": [1, 2, 3]})
+    result = pd.read_parquet(io.BytesIO(export_bytes("parquet", {"Data": df})))
+    assert result["BRANCH_ID"].tolist() == ["70100", "KC-01", None]
+    assert result["TOTAL"].tolist() == [1, 2, 3]
+    # DataFrame asal tidak ikut berubah
+    assert df["BRANCH_ID"].tolist() == [70100, "KC-01", None]
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from cpro.ingest import UploadCache
+from cpro.monitoring import BRANCH_COLUMNS, REALISASI_COLUMNS
+
+
+def _xlsx(path, frame):
+    frame.to_excel(path, index=False)
+    return path
+
+
+def _read_twice(tmp_path, path, columns, cache_dir):
+    first = UploadCache(cache_dir=cache_dir).read_excel(path, columns=columns)
+    # cache di memori (objek yang sama) dan cache Parquet di disk (objek baru)
+    cache = UploadCache(cache_dir=cache_dir)
+    cache.read_excel(path, columns=columns)
+    return first, cache.read_excel(path, columns=columns)
+
+
+def test_cache_hit_keeps_text_columns(tmp_path):
+    branch = _xlsx(tmp_path / "branch.xlsx", pd.DataFrame({
+        "BRANCH_ID": [70100, None, 7289, "KC-01"],
+        "BRANCH_NAME": ["A", "B", None, "D"],
+        "AREA": ["X", "X", "Y", None],
+    }))
+    real = _xlsx(tmp_path / "real.xlsx", pd.DataFrame({
+        "BRANCH_ID": [70100, 7289, None],
+        "LINE_OF_BUSINESS": ["L1", "L2", "L1"],
+        "EMPLOYEE_NUMBER": [123, None, 456],
+    }))
+    for path, columns in [(branch, BRANCH_COLUMNS), (real, REALISASI_COLUMNS)]:
+        for cache_dir in (tmp_path / "cache", None):
+            first, hit = _read_twice(tmp_path, path, columns, cache_dir)
+            pd.testing.assert_frame_equal(first, hit)
+            assert hit["BRANCH_ID"].dtype == object
+
+
+def test_cache_hit_keeps_integer_text_without_blanks(tmp_path):
+    path = _xlsx(tmp_path / "ids.xlsx", pd.DataFrame({"BRANCH_ID": [1, 2, 3], "BRANCH_NAME": ["a", "b", "c"]}))
+    first, hit = _read_twice(tmp_path, path, BRANCH_COLUMNS, tmp_path / "cache")
+    pd.testing.assert_frame_equal(first, hit)
+    assert hit["BRANCH_ID"].tolist() == [1, 2, 3]
+    assert not any(isinstance(v, (float, np.floating)) for v in hit["BRANCH_ID"])